@@ -90,8 +90,15 @@ with st.sidebar:
                                                stdout=subprocess.DEVNULL, 
                                                stderr=subprocess.DEVNULL)
                             
-                            # Give Ollama time to start
-                            time.sleep(5)
+                            # Give Ollama time to start, moving on as soon as it answers
+                            deadline = time.monotonic() + 5
+                            while time.monotonic() < deadline:
+                                try:
+                                    requests.get("http://localhost:11434/api/version", timeout=0.5)
+                                    break
+                                except requests.exceptions.RequestException:
+                                    pass
+                                time.sleep(0.25)
                             
                             # Now run the model
                             if sys.platform.startswith('win'):
@@ -102,9 +109,6 @@ with st.sidebar:
                                                stdout=subprocess.DEVNULL, 
                                                stderr=subprocess.DEVNULL)
                             
-                            # Wait a bit more
-                            time.sleep(3)
-                            
                             # Verify it's running
                             try:
                                 response = requests.get("http://localhost:11434/api/health", timeout=5)
@@ -6,11 +6,12 @@ This module checks and fixes font and contrast accessibility issues.
 
 import wcag_contrast_ratio as contrast
 from PIL import Image, ImageStat
-import numpy as np
 from pptx.dml.color import RGBColor
 from pptx.util import Pt
 
 class AccessibilityChecker:
+    __slots__ = ("min_contrast_ratio", "min_large_text_contrast_ratio", "min_font_size")
+    
     def __init__(self):
         # WCAG AA requires a minimum contrast ratio of 4.5:1 for normal text
         # and 3:1 for large text (18pt or 14pt bold)
@@ -14,12 +14,16 @@ from PIL import Image
 from io import BytesIO
 import logging
 import socket
+import threading
 
 class AltTextGenerator:
     """
     Generates alt text for images using LLaVA model via Ollama.
     """
     
+    # Seconds a successful availability check is trusted for
+    _API_CHECK_TTL = 30
+    
     def __init__(self, model="llava:latest", api_url="http://localhost:11434/api/generate"):
         """
         Initialize the alt text generator.
@@ -32,6 +36,9 @@ class AltTextGenerator:
         self.api_url = api_url
         self.logger = logging.getLogger(__name__)
         
+        # Time until which the last successful availability check is reused
+        self._api_ok_until = 0.0
+        
     # MODULE 1: Main Alt Text Generation
     def generate_alt_text(self, image_path, detailed=False):
         """Generate alt text for an image"""
@@ -69,6 +76,8 @@ class AltTextGenerator:
                     if response.status_code == 200:
                         return self._format_alt_text(response.json().get("response", ""), detailed)
                 except Exception as e:
+                    # Re-check the API next time instead of trusting the cached result
+                    self._api_ok_until = 0.0
                     print(f"Error generating alt text with Ollama: {e}")
                 
             # Fallback to placeholder text
@@ -191,6 +200,7 @@ class AltTextGenerator:
                         time.sleep(2)  # Wait before retrying
                     
             except requests.RequestException as e:
+                self._api_ok_until = 0.0
                 self.logger.error(f"Request failed: {str(e)}")
                 retries += 1
                 if retries <= max_retries:
@@ -231,9 +241,15 @@ class AltTextGenerator:
         """
         Check if the Ollama API is available.
         
+        A successful check is reused for _API_CHECK_TTL seconds, so callers can
+        check before every image without a network round trip each time.
+        
         Returns:
             bool: True if API is available, False otherwise
         """
+        if time.monotonic() < self._api_ok_until:
+            return True
+            
         try:
             # Try different Ollama API endpoints
             endpoints = [
@@ -247,6 +263,7 @@ class AltTextGenerator:
                 try:
                     response = requests.get(endpoint, timeout=5)
                     if response.status_code < 500:  # Accept any non-server error response
+                        self._api_ok_until = time.monotonic() + self._API_CHECK_TTL
                         return True
                 except:
                     continue
@@ -355,4 +372,18 @@ class AltTextGenerator:
         if detailed and len(text.split()) < 20:
             text = f"Primary slide image showing: {text}"
         
-        return text 
\ No newline at end of file
+        return text 
+
+# Shared generators by (model, api_url), so the availability check window is
+# reused across the UI and enhancement runs
+_generators = {}
+_generators_lock = threading.Lock()
+
+def get_alt_text_generator(model="llava:latest", api_url="http://localhost:11434/api/generate"):
+    """Get the shared AltTextGenerator for a model and API URL"""
+    key = (model, api_url)
+    with _generators_lock:
+        generator = _generators.get(key)
+        if generator is None:
+            generator = _generators[key] = AltTextGenerator(model, api_url)
+        return generator
@@ -6,9 +6,12 @@ Handles accessibility checking and scoring.
 import streamlit as st
 from src.ppt_processor import PPTProcessor
 from src.scoring import AccessibilityScorer
-from src.utils import create_wcag_compliance_chart
 import re
 
+# Markers of captions, footnotes and our own generated descriptions, which
+# are allowed a slightly smaller font. One alternation scans the text once.
+_CAPTION_RE = re.compile(r'^\*|Source:|Reference:|Image Description:|This image')
+
 def analyze_accessibility(pptx_file):
     """
     Analyze a PowerPoint file for accessibility issues
@@ -23,11 +26,13 @@ def analyze_accessibility(pptx_file):
         # Save the uploaded file to a temporary location
         import tempfile
         import os
+        import shutil
         
         # Create a temporary file
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pptx') as tmp:
-            # Write the file contents
-            tmp.write(pptx_file.getvalue())
+            # Stream the file contents in chunks rather than copying them into one bytes object
+            pptx_file.seek(0)
+            shutil.copyfileobj(pptx_file, tmp, length=1024 * 1024)
             tmp_path = tmp.name
         
         # Store the path in session state for later use
@@ -52,6 +57,10 @@ def analyze_accessibility(pptx_file):
         st.session_state.before_score = score_report
         st.session_state.wcag_report = wcag_report
         
+        # An error from enhancing a previous deck no longer applies
+        st.session_state.pop('last_error', None)
+        st.session_state.pop('last_error_tb', None)
+        
         return score_report, wcag_report
         
     except Exception as e:
@@ -284,15 +293,7 @@ def analyze_font_size(text_shapes):
             continue
         
         # Skip captions and generated content (which often have slightly smaller text for design purposes)
-        is_caption_or_footnote = (
-            len(text) < 100 and (
-                text.startswith("*") or
-                "Source:" in text or
-                "Reference:" in text or
-                "Image Description:" in text or
-                "This image" in text
-            )
-        )
+        is_caption_or_footnote = len(text) < 100 and _CAPTION_RE.search(text) is not None
         
         if font_size and font_size < min_recommended_size and not is_caption_or_footnote:
             small_font_shapes.append({
@@ -411,17 +412,9 @@ def analyze_contrast(text_shapes):
     # Track issues
     issues = []
     
-    # For now, we just identify potential issues with very light text
-    for text_data in text_shapes:
-        slide_num = text_data.get("slide_num", 0)
-        text = text_data.get("text", "").strip()
-        
-        # Skip empty text
-        if not text:
-            continue
-        
-        # In future, this would check actual contrast ratios between text and background
-        # For now, we'll assume most text has good contrast
+    # In future, this would walk text_shapes and check actual contrast ratios
+    # between text and background. For now, we'll assume most text has good
+    # contrast, so there is no per-shape work to do.
     
     # Default good contrast score until we can implement actual contrast checking
     score = 80
@@ -8,7 +8,7 @@ import shutil
 import time
 import os
 from src.utils import generate_report_html
-from src.alt_text_generator import AltTextGenerator
+from src.alt_text_generator import get_alt_text_generator
 import re
 
 def enhance_presentation_simple(ppt_processor, options):
@@ -51,12 +51,7 @@ def enhance_presentation_simple(ppt_processor, options):
         # Analyze the enhanced presentation to get updated scores
         from src.analysis import analyze_from_path
         
-        # Create a new processor for accurate scoring
-        from src.ppt_processor import PPTProcessor
-        output_processor = PPTProcessor()
-        output_processor.load_presentation(st.session_state.output_path)
-        
-        # Analyze with the new processor
+        # Analyze with a fresh processor for accurate scoring
         after_score, after_wcag_report = analyze_from_path(st.session_state.output_path)
         
         # Store the after analysis results in session state
@@ -89,7 +84,7 @@ def enhance_presentation_simple(ppt_processor, options):
 def process_alt_text_generation(ppt_processor, use_local_only=False):
     """Process alt text generation for all images in the presentation"""
     # Initialize the alt text generator
-    alt_text_generator = AltTextGenerator()
+    alt_text_generator = get_alt_text_generator()
     
     # Check if Ollama API is available
     api_available = not use_local_only and alt_text_generator.check_api_availability()
@@ -147,9 +142,10 @@ def create_image_slide_map(image_list):
         shape = img.get('shape')
         
         # Ensure shape is actually a picture (MsoShapeType.PICTURE = 13)
-        if shape is not None and hasattr(shape, 'shape_type'):
-            if shape.shape_type != 13:
-                print(f"Skipping shape on slide {slide_num+1} - shape_type {shape.shape_type} is not an image.")
+        shape_type = getattr(shape, 'shape_type', None) if shape is not None else None
+        if shape_type is not None:
+            if shape_type != 13:
+                print(f"Skipping shape on slide {slide_num+1} - shape_type {shape_type} is not an image.")
                 continue
         else:
             print(f"Skipping shape on slide {slide_num+1} - no valid shape or shape_type.")
@@ -383,12 +379,12 @@ def process_contrast_improvement(ppt_processor):
 # MODULE 4: TEXT SIMPLIFICATION
 def process_text_simplification(ppt_processor, use_local_only=False):
     """Process text simplification"""
-    from src.text_simplifier import TextSimplifier
+    from src.text_simplifier import get_simplifier
     
     progress_message = st.empty()
     progress_message.info("Simplifying complex text...")
     
-    text_simplifier = TextSimplifier()
+    text_simplifier = get_simplifier()
     
     # Check if Ollama API is available
     api_available = not use_local_only and text_simplifier.check_api_availability()
@@ -430,16 +426,16 @@ def process_text_simplification(ppt_processor, use_local_only=False):
     if total_complex > 0:
         print(f"Found {total_complex} complex text elements to simplify")
     
+    # Simplify the texts up front so API requests can run concurrently
+    if api_available:
+        simplified_texts = text_simplifier.simplify_texts(text for _, _, text in complex_texts)
+    else:
+        # Use basic simplification if API not available
+        simplified_texts = [text_simplifier.basic_simplify(text) for _, _, text in complex_texts]
+    
     # Process complex texts
-    for slide_num, shape, text in complex_texts:
+    for (slide_num, shape, text), simplified_text in zip(complex_texts, simplified_texts):
         try:
-            # Simplify the text
-            if api_available:
-                simplified_text = text_simplifier.simplify_text(text)
-            else:
-                # Use basic simplification if API not available
-                simplified_text = text_simplifier.basic_simplify(text)
-            
             # Only apply simplification if it actually improves complexity
             if simplified_text and simplified_text != text:
                 # Check if simplified text is actually less complex
@@ -7,7 +7,6 @@ with distinct components for different extraction tasks.
 
 import os
 import subprocess
-import magic
 from pptx import Presentation
 from pptx.util import Pt, Inches
 from pptx.enum.shapes import MSO_SHAPE_TYPE
@@ -16,13 +15,40 @@ import tempfile
 from PIL import Image
 import io
 import shutil
+from functools import lru_cache
 from pptx.dml.color import RGBColor
 
+# Half of the maximum 299/587/114-weighted luma sum (1000 * 255 / 2)
+LUMA_MIDPOINT = 127500
+
+@lru_cache(maxsize=None)
+def _mime_detector():
+    """
+    Load python-magic and its database once, on first use.
+    
+    Raises ImportError when python-magic is not installed; the failure is not
+    cached, so callers keep falling back to the header check.
+    """
+    import magic
+    return magic.Magic(mime=True)
+
 class PPTProcessor:
-    def __init__(self):
+    def __init__(self, collect_shapes=True):
+        """
+        Args:
+            collect_shapes (bool): Build the image_shapes/text_shapes lists when
+                loading. When False, only the image_count, text_count and
+                wmf_count counters are filled in, which skips the text run walk
+                and saving regular images to disk. In both modes wmf_count is
+                the number of WMF images that could not be converted or loaded.
+        """
         self.presentation = None
+        self.collect_shapes = collect_shapes
         self.image_shapes = []
         self.text_shapes = []
+        self.image_count = 0
+        self.text_count = 0
+        self.wmf_count = 0
         self.temp_dir = tempfile.mkdtemp()
         
     def load_presentation(self, file_path):
@@ -102,8 +128,8 @@ class PPTProcessor:
             d.text((200, 140), "This image format requires conversion for accessibility", 
                    fill=(102, 102, 102), font=small_font, anchor="mm")
             
-            # Save the image
-            img.save(output_path)
+            # Save the image; a flat placeholder needs no heavy compression
+            img.save(output_path, compress_level=1)
             return output_path
         except:
             # If all methods fail, return None
@@ -114,31 +140,60 @@ class PPTProcessor:
         """Extract content from the presentation"""
         self.image_shapes = []
         self.text_shapes = []
+        self.image_count = 0
+        self.text_count = 0
+        self.wmf_count = 0
+        collect = self.collect_shapes
         
         for slide_idx, slide in enumerate(self.presentation.slides):
             for shape_idx, shape in enumerate(slide.shapes):
                 # Process text in the shape
                 if shape.has_text_frame:
-                    self._extract_text_content(slide_idx, shape)
+                    self.text_count += 1
+                    if collect:
+                        self._extract_text_content(slide_idx, shape)
                 
                 # Extract images
                 if shape.shape_type == MSO_SHAPE_TYPE.PICTURE:
-                    self._extract_image_content(slide_idx, shape_idx, shape)
+                    self.image_count += 1
+                    if collect:
+                        self._extract_image_content(slide_idx, shape_idx, shape)
+                    else:
+                        self._count_image_format(slide_idx, shape_idx, shape)
+    
+    def _count_image_format(self, slide_idx, shape_idx, shape):
+        """
+        Count a WMF image the same way extraction does, without recording it (stats-only mode)
+        
+        A WMF/EMF picture counts when its conversion fails, and any other picture
+        counts when PIL cannot load it as WMF; regular images are not saved.
+        """
+        try:
+            image_data = shape.image.blob
+            if self._get_image_type(image_data) in ("wmf", "emf"):
+                if not self._convert_wmf_to_png(image_data, slide_idx, shape_idx):
+                    self.wmf_count += 1
+            else:
+                try:
+                    Image.open(io.BytesIO(image_data)).load()
+                except OSError as e:
+                    if "WMF" in str(e).upper():
+                        self.wmf_count += 1
+        except Exception:
+            pass
     
     # EXTRACTION MODULE 3: Text Content Extraction
     def _extract_text_content(self, slide_idx, shape):
         """Extract text content from shapes with text frames"""
-        text_frame = shape.text_frame
-        text = ""
-        font_size = None
+        # Query the runs' XML directly instead of building paragraph, run and
+        # font proxies for every run; two XPath scans cover the whole frame
+        txBody = shape.text_frame._txBody
+        text = "".join(txBody.xpath("./a:p/a:r/a:t/text()"))
         
-        for paragraph in text_frame.paragraphs:
-            for run in paragraph.runs:
-                text += run.text
-                if run.font.size:
-                    # Convert from EMU to points
-                    size_pt = run.font.size.pt
-                    font_size = size_pt if font_size is None else min(font_size, size_pt)
+        # Run sizes are stored in hundredths of a point
+        sizes = [int(sz) for sz in txBody.xpath("./a:p/a:r/a:rPr/@sz")]
+        sizes = [sz for sz in sizes if sz]
+        font_size = min(sizes) / 100 if sizes else None
         
         self.text_shapes.append({
             "slide_num": slide_idx,
@@ -214,6 +269,7 @@ class PPTProcessor:
             })
         else:
             # If conversion failed, add placeholder with information
+            self.wmf_count += 1
             self.image_shapes.append({
                 "slide_num": slide_idx,
                 "shape_idx": shape_idx,
@@ -229,13 +285,17 @@ class PPTProcessor:
     def _handle_regular_image(self, image_data, slide_idx, shape_idx, shape, alt_text):
         """Handle regular image formats"""
         try:
-            # Try to open the image
+            # Try to open and decode the image, so unsupported (WMF) and corrupt
+            # data still raises here
             image = Image.open(io.BytesIO(image_data))
+            image.load()
             
-            # Save the image to a temporary file
+            # Save the original bytes to a temporary file; they are already in
+            # image.format, so decoding and re-encoding them would only cost time
             ext = "." + (image.format.lower() if image.format else "png")
             img_path = os.path.join(self.temp_dir, f"slide_{slide_idx}_shape_{shape_idx}{ext}")
-            image.save(img_path)
+            with open(img_path, "wb") as f:
+                f.write(image_data)
             
             self.image_shapes.append({
                 "slide_num": slide_idx,
@@ -248,6 +308,7 @@ class PPTProcessor:
             # Check if "WMF" is in the error - indicates unsupported format
             if "WMF" in str(e).upper():
                 # Instead of raising an error, set a warning flag and include shape_idx
+                self.wmf_count += 1
                 self.image_shapes.append({
                     "slide_num": slide_idx,
                     "shape_idx": shape_idx,
@@ -264,9 +325,7 @@ class PPTProcessor:
     def _get_image_type(self, image_data):
         """Determine image type from binary data"""
         try:
-            import magic
-            mime = magic.Magic(mime=True)
-            mime_type = mime.from_buffer(image_data)
+            mime_type = _mime_detector().from_buffer(image_data)
             
             if mime_type == "image/x-wmf" or "wmf" in mime_type:
                 return "wmf"
@@ -297,8 +356,9 @@ class PPTProcessor:
         font_size = None
         for paragraph in shape.text_frame.paragraphs:
             for run in paragraph.runs:
-                if run.font.size:
-                    size_pt = run.font.size.pt
+                size = run.font.size
+                if size:
+                    size_pt = size.pt
                     font_size = size_pt if font_size is None else min(font_size, size_pt)
         
         return font_size
@@ -419,15 +479,17 @@ class PPTProcessor:
                         continue
                         
                     # Only increase font size if it's smaller than the new size
-                    current_size = run.font.size.pt if hasattr(run.font, 'size') and run.font.size else None
+                    font = run.font
+                    size = font.size
+                    current_size = size.pt if size else None
                     
                     if current_size is None:
                         # If size isn't set, set it to the new size
-                        run.font.size = Pt(new_size)
+                        font.size = Pt(new_size)
                         changed = True
                     elif current_size < new_size:
                         # Only increase font size if it's too small
-                        run.font.size = Pt(new_size)
+                        font.size = Pt(new_size)
                         changed = True
                     # else: keep the existing size if it's already large enough
             
@@ -471,39 +533,38 @@ class PPTProcessor:
             for paragraph in text_frame.paragraphs:
                 for run in paragraph.runs:
                     # Skip if font or color is not set
-                    if not hasattr(run, 'font') or not hasattr(run.font, 'color'):
+                    font = getattr(run, 'font', None)
+                    color = getattr(font, 'color', None)
+                    if font is None or color is None:
                         continue
                         
-                    # Check if color is None or doesn't have rgb property
-                    if not run.font.color or not hasattr(run.font.color, 'rgb'):
-                        continue
+                    # Check if color doesn't have rgb property
+                    current_color = getattr(color, 'rgb', None)
                         
-                    # Handle case where rgb exists but is None
-                    if run.font.color.rgb is None:
+                    # Handle case where rgb is missing or None
+                    if current_color is None:
                         continue
                     
                     try:
-                        # Get current RGB values - handle different color object types
-                        current_color = run.font.color.rgb
-                        
                         # Check if color has r, g, b attributes
                         if not all(hasattr(current_color, attr) for attr in ['r', 'g', 'b']):
                             continue
                             
                         r, g, b = current_color.r, current_color.g, current_color.b
                         
-                        # Calculate luminance
-                        luminance = (0.299 * r + 0.587 * g + 0.114 * b) / 255
+                        # Integer form of the luminance test: (0.299r + 0.587g + 0.114b) / 255
+                        # compared with 0.5 is the weighted sum below compared with LUMA_MIDPOINT
+                        luma = 299 * r + 587 * g + 114 * b
                         
                         if make_darker:
                             # If it's light, make it dark (for better contrast on light backgrounds)
-                            if luminance > 0.5:
-                                run.font.color.rgb = RGBColor(0, 0, 0)  # Black
+                            if luma > LUMA_MIDPOINT:
+                                color.rgb = RGBColor(0, 0, 0)  # Black
                                 changed = True
                         else:
                             # If it's dark, make it light (for better contrast on dark backgrounds)
-                            if luminance < 0.5:
-                                run.font.color.rgb = RGBColor(255, 255, 255)  # White
+                            if luma < LUMA_MIDPOINT:
+                                color.rgb = RGBColor(255, 255, 255)  # White
                                 changed = True
                     except AttributeError:
                         # Skip this run if any attribute errors occur when accessing color properties
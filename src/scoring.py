@@ -4,39 +4,60 @@ Accessibility Scoring Module
 This module implements an accessibility scoring system similar to Canvas Ally.
 """
 
+import bisect
+import logging
+import operator
+
+logger = logging.getLogger(__name__)
+
+# Issue messages by code. Issues are recorded as (code, *args) tuples and
+# only formatted into text when a report is requested.
+_ISSUE_MESSAGES = {
+    "missing_alt": "Slide {0}: Missing alt text",
+    "short_alt": "Slide {0}: Alt text too short",
+    "small_font": "Slide {0}: Font size {1}pt is too small",
+    "complex_text": "Slide {0}: Text is too complex",
+}
+
+# Scoring categories. The weights and scores dicts are both built from this
+# tuple so their values() line up for the weighted sum in calculate_overall_score.
+_CATEGORIES = ("alt_text", "font_size", "contrast", "text_complexity")
+
+# Summary bands: a score below _THRESHOLDS[i] gets _SUMMARIES[i], and a
+# score at or above the last threshold gets the last summary
+_THRESHOLDS = (50, 70, 90)
+_SUMMARIES = (
+    "Poor accessibility. Major issues need immediate attention.",
+    "Fair accessibility. Several important issues to address.",
+    "Good accessibility. Some improvements recommended.",
+    "Excellent accessibility. Minor improvements possible.",
+)
+
+def _format_issue(issue):
+    """Format a recorded issue; free-text descriptions pass through unchanged"""
+    if isinstance(issue, tuple):
+        code, *args = issue
+        return _ISSUE_MESSAGES[code].format(*args)
+    return issue
+
 class AccessibilityScorer:
+    __slots__ = ("weights", "scores", "issues", "evaluated_items", "_sums")
+    
     def __init__(self):
         # Define scoring criteria weights
-        self.weights = {
-            "alt_text": 0.3,
-            "font_size": 0.25,
-            "contrast": 0.25,
-            "text_complexity": 0.2
-        }
+        self.weights = dict(zip(_CATEGORIES, (0.3, 0.25, 0.25, 0.2)))
         
         # Track individual scores
-        self.scores = {
-            "alt_text": 0,
-            "font_size": 0,
-            "contrast": 0,
-            "text_complexity": 0
-        }
+        self.scores = dict.fromkeys(_CATEGORIES, 0)
         
         # Track issues
-        self.issues = {
-            "alt_text": [],
-            "font_size": [],
-            "contrast": [],
-            "text_complexity": []
-        }
+        self.issues = {category: [] for category in _CATEGORIES}
         
         # Track evaluated items
-        self.evaluated_items = {
-            "alt_text": 0,
-            "font_size": 0,
-            "contrast": 0,
-            "text_complexity": 0
-        }
+        self.evaluated_items = dict.fromkeys(_CATEGORIES, 0)
+        
+        # Running totals of added scores, so add_score keeps an exact mean
+        self._sums = dict.fromkeys(_CATEGORIES, 0.0)
     
     def calculate_alt_text_score(self, image_shapes):
         """Calculate score for alt text"""
@@ -51,21 +72,22 @@ class AccessibilityScorer:
             alt = img.get("alt_text", "")
             
             # Debug the alt text being checked
-            print(f"Scoring alt text for image: '{alt}'")
+            logger.debug("Scoring alt text for image: %r", alt)
             
             if not alt or alt.strip() == "":
                 missing_alt += 1
-                self.issues["alt_text"].append(f"Slide {img['slide_num']+1}: Missing alt text")
+                self.issues["alt_text"].append(("missing_alt", img['slide_num'] + 1))
             elif len(alt) < 10:
                 poor_alt += 1
-                self.issues["alt_text"].append(f"Slide {img['slide_num']+1}: Alt text too short")
+                self.issues["alt_text"].append(("short_alt", img['slide_num'] + 1))
         
         total = len(image_shapes)
         score = 100 - (missing_alt * 100 / total) - (poor_alt * 30 / total)
-        score = max(0, min(100, score))
+        score = score if score > 0 else 0
         
         # Debug the calculated score
-        print(f"Alt text score calculation: total={total}, missing={missing_alt}, poor={poor_alt}, score={score}")
+        logger.debug("Alt text score calculation: total=%d, missing=%d, poor=%d, score=%s",
+                     total, missing_alt, poor_alt, score)
         
         self.scores["alt_text"] = score
         return score
@@ -76,21 +98,16 @@ class AccessibilityScorer:
             self.scores["font_size"] = 100
             return 100
             
-        small_fonts = 0
-        
-        for text in text_shapes:
-            font_size = text.get("font_size")
-            
-            if font_size is None:
-                continue
-                
-            if font_size < 18:
-                small_fonts += 1
-                self.issues["font_size"].append(f"Slide {text['slide_num']+1}: Font size {font_size}pt is too small")
+        # Collect the issues for sized text below 18pt in one pass
+        small = [("small_font", text['slide_num'] + 1, text["font_size"])
+                 for text in text_shapes
+                 if text.get("font_size") is not None and text["font_size"] < 18]
+        self.issues["font_size"].extend(small)
+        small_fonts = len(small)
         
         total = len(text_shapes)
         score = 100 - (small_fonts * 100 / total)
-        score = max(0, min(100, score))
+        score = score if score > 0 else 0
         
         self.scores["font_size"] = score
         return score
@@ -103,7 +120,7 @@ class AccessibilityScorer:
             
         self.issues["contrast"] = contrast_issues
         score = 100 - (len(contrast_issues) * 20)
-        score = max(0, min(100, score))
+        score = score if score > 0 else 0
         
         self.scores["contrast"] = score
         return score
@@ -120,11 +137,11 @@ class AccessibilityScorer:
             # If the simplified text is significantly different, consider the original complex
             if len(orig) > 100 and self._text_difference_ratio(orig, simp) > 0.3:
                 complex_texts += 1
-                self.issues["text_complexity"].append(f"Slide {i+1}: Text is too complex")
+                self.issues["text_complexity"].append(("complex_text", i + 1))
         
         total = len(original_texts)
         score = 100 - (complex_texts * 100 / total)
-        score = max(0, min(100, score))
+        score = score if score > 0 else 0
         
         self.scores["text_complexity"] = score
         return score
@@ -132,27 +149,39 @@ class AccessibilityScorer:
     def _text_difference_ratio(self, text1, text2):
         """Calculate how different two texts are (0 to 1)"""
         # Simple character difference ratio
-        longer = max(len(text1), len(text2))
-        if longer == 0:
+        len1, len2 = len(text1), len(text2)
+        if len1 < len2:
+            len1, len2 = len2, len1
+        if len1 == 0:
             return 0
-        return abs(len(text1) - len(text2)) / longer
+        return (len1 - len2) / len1
     
     def calculate_overall_score(self):
         """Calculate overall accessibility score"""
-        weighted_score = sum(score * self.weights[category] 
-                          for category, score in self.scores.items())
+        # Both dicts share the _CATEGORIES key order, so pair values directly
+        weighted_score = sum(map(operator.mul, self.scores.values(), self.weights.values()))
         
         # Round to nearest integer
         return round(weighted_score)
     
+    def formatted_issues(self):
+        """Get the recorded issues as human-readable messages per category"""
+        return {category: [_format_issue(issue) for issue in issues]
+                for category, issues in self.issues.items()}
+    
     def get_report(self):
-        """Generate a detailed accessibility report"""
+        """
+        Generate a detailed accessibility report
+        
+        The returned "category_scores" is the scorer's own scores dict, not a
+        copy, so treat the report as read-only; "issues" is freshly formatted.
+        """
         overall = self.calculate_overall_score()
         
         report = {
             "overall_score": overall,
-            "category_scores": self.scores.copy(),
-            "issues": self.issues.copy(),
+            "category_scores": self.scores,
+            "issues": self.formatted_issues(),
             "summary": self._get_summary(overall)
         }
         
@@ -160,21 +189,14 @@ class AccessibilityScorer:
     
     def _get_summary(self, score):
         """Get a summary based on the score"""
-        if score >= 90:
-            return "Excellent accessibility. Minor improvements possible."
-        elif score >= 70:
-            return "Good accessibility. Some improvements recommended."
-        elif score >= 50:
-            return "Fair accessibility. Several important issues to address."
-        else:
-            return "Poor accessibility. Major issues need immediate attention."
+        return _SUMMARIES[bisect.bisect_right(_THRESHOLDS, score)]
     
     def add_score(self, category, score, description):
         """Add a score for a specific category"""
         if category in self.scores:
-            current_total = self.scores[category] * self.evaluated_items[category]
+            self._sums[category] += score
             self.evaluated_items[category] += 1
-            self.scores[category] = (current_total + score) / self.evaluated_items[category]
+            self.scores[category] = self._sums[category] / self.evaluated_items[category]
             
             # Add to issues if score is below threshold
             if score < 70:
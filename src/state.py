@@ -6,39 +6,39 @@ Handles session state initialization and management.
 import streamlit as st
 import tempfile
 import os
+import shutil
+
+# Default values for session state variables
+_DEFAULTS = {
+    'before_score': None,
+    'after_score': None,
+    'enhanced_file_path': None,
+    'report_html': None,
+    'temp_dir': None,
+    'input_path': None,
+    'output_path': None,
+    'analyzed': False,
+    'ppt_processor': None,
+    'wcag_report': None,
+    'enhance_button_pressed': False,
+    'last_error': None,
+    'last_error_tb': None,
+}
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'before_score' not in st.session_state:
-        st.session_state.before_score = None
-    if 'after_score' not in st.session_state:
-        st.session_state.after_score = None
-    if 'enhanced_file_path' not in st.session_state:
-        st.session_state.enhanced_file_path = None
-    if 'report_html' not in st.session_state:
-        st.session_state.report_html = None
-    if 'temp_dir' not in st.session_state:
-        st.session_state.temp_dir = None
-    if 'input_path' not in st.session_state:
-        st.session_state.input_path = None
-    if 'output_path' not in st.session_state:
-        st.session_state.output_path = None
-    if 'analyzed' not in st.session_state:
-        st.session_state.analyzed = False
-    if 'ppt_processor' not in st.session_state:
-        st.session_state.ppt_processor = None
-    if 'wcag_report' not in st.session_state:
-        st.session_state.wcag_report = None
-    if 'enhance_button_pressed' not in st.session_state:
-        st.session_state.enhance_button_pressed = False
+    for key, value in _DEFAULTS.items():
+        st.session_state.setdefault(key, value)
 
 def setup_file_paths(uploaded_file):
     """Setup temporary file paths for processing"""
     temp_dir = tempfile.mkdtemp()
     input_path = os.path.join(temp_dir, "input.pptx")
     
+    # Stream the upload to disk in 1 MiB chunks
+    uploaded_file.seek(0)
     with open(input_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+        shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
     
     # Store paths in session state
     st.session_state.temp_dir = temp_dir
@@ -5,14 +5,31 @@ This script tests the extraction of content from PowerPoint files
 and the generation of alt text using Ollama AI.
 """
 
+import io
 import os
 import sys
 import tempfile
+import traceback
+import shutil
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 from src.ppt_processor import PPTProcessor
 from src.alt_text_generator import AltTextGenerator
 
+def _format_error(prefix, exc):
+    """
+    Format an exception raised in one of the tests, with its traceback.
+    
+    Args:
+        prefix (str): Description of what failed
+        exc (Exception): The exception being handled
+        
+    Returns:
+        str: The error message
+    """
+    return f"{prefix}: {str(exc)}\n{traceback.format_exc()}"
+
 def test_pptx_extraction(pptx_path, verbose=False):
     """
     Test extraction of content from a PowerPoint file.
@@ -27,8 +44,8 @@ def test_pptx_extraction(pptx_path, verbose=False):
     try:
         print(f"Testing extraction from: {pptx_path}")
         
-        # Create a processor
-        processor = PPTProcessor()
+        # Create a processor; the shape details are only needed for verbose output
+        processor = PPTProcessor(collect_shapes=verbose)
         
         # Load the presentation
         processor.load_presentation(pptx_path)
@@ -36,10 +53,9 @@ def test_pptx_extraction(pptx_path, verbose=False):
         # Get statistics
         stats = {
             "slides": len(processor.presentation.slides),
-            "images": len(processor.image_shapes),
-            "text_shapes": len(processor.text_shapes),
-            "wmf_images": len([img for img in processor.image_shapes 
-                              if 'warning' in img and 'WMF' in img.get('warning', '')])
+            "images": processor.image_count,
+            "text_shapes": processor.text_count,
+            "wmf_images": processor.wmf_count
         }
         
         # Print statistics
@@ -51,28 +67,32 @@ def test_pptx_extraction(pptx_path, verbose=False):
         
         # Print detailed information if verbose
         if verbose:
-            print("\nDetailed Information:")
+            # Build the details in a buffer and write them out once
+            buf = io.StringIO()
+            buf.write("\nDetailed Information:\n")
             
-            # Print information about images
-            print("\nImages:")
+            # Information about images
+            buf.write("\nImages:\n")
             for i, img in enumerate(processor.image_shapes):
                 slide_num = img.get("slide_num", 0) + 1
                 has_alt = "Yes" if img.get("alt_text") else "No"
                 img_path = img.get("image_path", "N/A")
                 warnings = img.get("warning", "None")
                 
-                print(f"  {i+1}. Slide {slide_num} - Has Alt: {has_alt} - Path: {img_path} - Warnings: {warnings}")
+                buf.write(f"  {i+1}. Slide {slide_num} - Has Alt: {has_alt} - Path: {img_path} - Warnings: {warnings}\n")
             
-            # Print information about text shapes
-            print("\nText Shapes:")
+            # Information about text shapes
+            buf.write("\nText Shapes:\n")
             for i, txt in enumerate(processor.text_shapes):
                 slide_num = txt.get("slide_num", 0) + 1
                 font_size = txt.get("font_size", "Unknown")
-                text = txt.get("text", "")
+                text = " ".join(txt.get("text", "").split())
                 if len(text) > 50:
                     text = text[:47] + "..."
                 
-                print(f"  {i+1}. Slide {slide_num} - Font Size: {font_size} - Text: {text}")
+                buf.write(f"  {i+1}. Slide {slide_num} - Font Size: {font_size} - Text: {text}\n")
+            
+            sys.stdout.write(buf.getvalue())
         
         # Clean up
         processor.cleanup()
@@ -80,8 +100,7 @@ def test_pptx_extraction(pptx_path, verbose=False):
         return True, stats, None
         
     except Exception as e:
-        import traceback
-        error_msg = f"Error during extraction: {str(e)}\n{traceback.format_exc()}"
+        error_msg = _format_error("Error during extraction", e)
         print(error_msg)
         return False, None, error_msg
 
@@ -118,11 +137,25 @@ def test_alt_text_generation(image_path, verbose=False):
         return True, alt_text, None
         
     except Exception as e:
-        import traceback
-        error_msg = f"Error during alt text generation: {str(e)}\n{traceback.format_exc()}"
+        error_msg = _format_error("Error during alt text generation", e)
         print(error_msg)
         return False, None, error_msg
 
+def _copy_image(job):
+    """
+    Copy one extracted image to the output directory.
+    
+    Args:
+        job (tuple): (source path, destination path, slide number)
+        
+    Returns:
+        str: The destination path
+    """
+    img_path, output_path, slide_num = job
+    # copyfile uses the OS fast-copy path (sendfile on Linux) where available
+    shutil.copyfile(img_path, output_path)
+    return output_path
+
 def extract_images_from_pptx(pptx_path, output_dir=None):
     """
     Extract images from a PowerPoint file to disk.
@@ -149,8 +182,8 @@ def extract_images_from_pptx(pptx_path, output_dir=None):
         # Load the presentation
         processor.load_presentation(pptx_path)
         
-        # Extract images
-        image_paths = []
+        # Collect the copy jobs
+        jobs = []
         for i, img in enumerate(processor.image_shapes):
             slide_num = img.get("slide_num", 0) + 1
             img_path = img.get("image_path")
@@ -159,14 +192,17 @@ def extract_images_from_pptx(pptx_path, output_dir=None):
                 # Copy to output directory
                 ext = os.path.splitext(img_path)[1]
                 output_path = os.path.join(output_dir, f"slide_{slide_num}_image_{i+1}{ext}")
-                
-                # Copy the file
-                with open(img_path, "rb") as src_file:
-                    with open(output_path, "wb") as dst_file:
-                        dst_file.write(src_file.read())
-                        
-                image_paths.append(output_path)
-                print(f"Extracted image from slide {slide_num} to {output_path}")
+                jobs.append((img_path, output_path, slide_num))
+        
+        # Copy the files in parallel; file I/O releases the GIL
+        image_paths = []
+        if jobs:
+            max_workers = min(16, (os.cpu_count() or 1) * 2, len(jobs))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                image_paths = list(executor.map(_copy_image, jobs))
+        
+        for (_, output_path, slide_num) in jobs:
+            print(f"Extracted image from slide {slide_num} to {output_path}")
         
         # Clean up
         processor.cleanup()
@@ -174,8 +210,7 @@ def extract_images_from_pptx(pptx_path, output_dir=None):
         return True, image_paths, None
         
     except Exception as e:
-        import traceback
-        error_msg = f"Error extracting images: {str(e)}\n{traceback.format_exc()}"
+        error_msg = _format_error("Error extracting images", e)
         print(error_msg)
         return False, None, error_msg
 
@@ -201,6 +236,25 @@ def batch_test_alt_text(pptx_path, verbose=False):
         if not image_paths:
             return False, None, "No images found in the presentation."
         
+        return batch_test_image_alt_text(image_paths, verbose)
+        
+    except Exception as e:
+        error_msg = _format_error("Error during batch alt text generation", e)
+        print(error_msg)
+        return False, None, error_msg
+
+def batch_test_image_alt_text(image_paths, verbose=False):
+    """
+    Test batch alt text generation for a list of image files.
+    
+    Args:
+        image_paths (list): Paths to the image files
+        verbose (bool): Whether to print verbose output
+        
+    Returns:
+        tuple: (success, results, error_message)
+    """
+    try:
         # Create a generator
         generator = AltTextGenerator()
         
@@ -232,8 +286,7 @@ def batch_test_alt_text(pptx_path, verbose=False):
         return True, results, None
         
     except Exception as e:
-        import traceback
-        error_msg = f"Error during batch alt text generation: {str(e)}\n{traceback.format_exc()}"
+        error_msg = _format_error("Error during batch alt text generation", e)
         print(error_msg)
         return False, None, error_msg
 
@@ -241,7 +294,7 @@ def main():
     """Main function to run the tests."""
     parser = argparse.ArgumentParser(description="Test PowerPoint extraction and alt text generation")
     parser.add_argument("--pptx", type=str, help="Path to a PowerPoint file")
-    parser.add_argument("--image", type=str, help="Path to an image file")
+    parser.add_argument("--image", "--images", type=str, nargs="+", help="Path to one or more image files")
     parser.add_argument("--extract", action="store_true", help="Extract images from the PowerPoint file")
     parser.add_argument("--batch", action="store_true", help="Test batch alt text generation")
     parser.add_argument("--verbose", "-v", action="store_true", help="Print verbose output")
@@ -249,7 +302,7 @@ def main():
     args = parser.parse_args()
     
     if not args.pptx and not args.image:
-        print("Error: You must specify either a PowerPoint file (--pptx) or an image file (--image)")
+        print("Error: You must specify either a PowerPoint file (--pptx) or image files (--image)")
         return 1
     
     if args.pptx:
@@ -284,12 +337,20 @@ def main():
             print(f"Successfully generated alt text for {len(results)} images.")
     
     if args.image:
-        # Test alt text generation
-        success, alt_text, error = test_alt_text_generation(args.image, args.verbose)
-        
-        if not success:
-            print("Alt text generation test failed.")
-            return 1
+        if len(args.image) == 1:
+            # Test alt text generation
+            success, alt_text, error = test_alt_text_generation(args.image[0], args.verbose)
+            
+            if not success:
+                print("Alt text generation test failed.")
+                return 1
+        else:
+            # Test batch alt text generation for all the images together
+            success, results, error = batch_test_image_alt_text(args.image, args.verbose)
+            
+            if not success:
+                print("Batch alt text generation failed.")
+                return 1
     
     print("All tests completed successfully.")
     return 0
@@ -5,13 +5,97 @@ This module simplifies complex text to improve readability.
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import re
+import json
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+@lru_cache(maxsize=512)
+def _text_stats(text):
+    """Return (word_count, total_word_length) for the whitespace-delimited words in text"""
+    words = text.split()
+    return len(words), sum(map(len, words))
 
 class TextSimplifier:
-    def __init__(self, model_name="llama3", api_url="http://localhost:11434/api/generate"):
+    # Complex words and their simpler alternatives for basic_simplify
+    _REPLACEMENTS = {
+        "utilize": "use",
+        "implementation": "use",
+        "facilitate": "help",
+        "consequently": "so",
+        "subsequently": "then",
+        "additionally": "also",
+        "furthermore": "also",
+        "demonstrate": "show",
+        "modification": "change",
+        "sufficient": "enough",
+        "requirement": "need",
+        "prioritize": "focus on",
+        "fundamental": "basic",
+        "endeavor": "try"
+    }
+    _REPLACEMENT_RE = re.compile(r'\b(' + '|'.join(map(re.escape, _REPLACEMENTS)) + r')\b', re.IGNORECASE)
+    # A sentence and its terminator (if any)
+    _SENTENCE_RE = re.compile(r'[^.!?]*[.!?]?')
+    _CLAUSE_SPLIT_RE = re.compile(r',\s*|\s+(?:and|but|or|so|because)\s+')
+    _WHITESPACE_RE = re.compile(r'\s+')
+    _SENTENCE_END_RE = re.compile(r'[.!?]+')
+    
+    # Filler phrases removed by _condense_text
+    _REDUNDANT_PHRASES = [
+        "it is important to note that",
+        "it should be noted that",
+        "it is worth mentioning that",
+        "as you can see",
+        "as shown above"
+    ]
+    _REDUNDANT_PHRASE_RE = re.compile('|'.join(map(re.escape, _REDUNDANT_PHRASES)))
+    _NUMBERED_LINE_RE = re.compile(r'^\s*(\d+):\s*(.*)$', re.MULTILINE)
+    
+    # Limits for packing several texts into one API request: at most this many
+    # texts, and roughly 1k prompt tokens (~4 characters each) of input text
+    _PACK_MAX_ITEMS = 8
+    _PACK_MAX_CHARS = 4096
+    
+    # Context window requested from Ollama. It is the same for every request,
+    # since a different num_ctx makes Ollama reload the model; 2048 tokens fits
+    # a full packed batch and its reply.
+    _NUM_CTX = 2048
+    
+    # Seconds a successful availability check is trusted for
+    _API_CHECK_TTL = 30
+    
+    def __init__(self, model_name="llama3", api_url="http://localhost:11434/api/generate", max_workers=4, cache_size=1024):
         """Initialize the text simplifier with the specified model"""
         self.model_name = model_name
         self.api_url = api_url
+        # Number of requests to keep in flight; Ollama serves up to
+        # OLLAMA_NUM_PARALLEL of them at once
+        self.max_workers = max_workers
+        
+        # Reuse keep-alive connections to Ollama instead of reconnecting per request.
+        # Keep at least one pooled connection per worker thread, so concurrent
+        # requests don't open throwaway connections when the pool is full.
+        self.session = requests.Session()
+        pool_size = max(10, max_workers)
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Connection": "keep-alive", "Accept-Encoding": "gzip"})
+        
+        # LRU cache of API results keyed by a hash of the original text, so
+        # repeated text (footers, headings) is only simplified once
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Time until which the last successful availability check is reused
+        self._api_ok_until = 0.0
     
     def is_text_complex(self, text):
         """Determine if text is complex and needs simplification"""
@@ -19,16 +103,16 @@ class TextSimplifier:
             return False
             
         # Check complexity based on word length and sentence length
-        words = text.split()
-        if len(words) < 15:  # Short texts aren't complex
+        word_count, word_length = _text_stats(text)
+        if word_count < 15:  # Short texts aren't complex
             return False
             
         # Calculate average word length
-        avg_word_length = sum(len(word) for word in words) / len(words)
+        avg_word_length = word_length / word_count
         
         # Calculate sentence length
-        sentences = re.split(r'[.!?]+', text)
-        avg_sentence_length = len(words) / max(1, len([s for s in sentences if s.strip()]))
+        sentences = self._SENTENCE_END_RE.split(text)
+        avg_sentence_length = word_count / max(1, sum(1 for s in sentences if s.strip()))
         
         # Text is complex if average word length is high or sentences are long
         return (avg_word_length > 6) or (avg_sentence_length > 20)
@@ -38,42 +122,19 @@ class TextSimplifier:
         if not text or len(text) < 15:
             return text
             
-        # Replace complex words with simpler alternatives
-        replacements = {
-            "utilize": "use",
-            "implementation": "use",
-            "facilitate": "help",
-            "consequently": "so",
-            "subsequently": "then",
-            "additionally": "also",
-            "furthermore": "also",
-            "demonstrate": "show",
-            "modification": "change",
-            "sufficient": "enough",
-            "requirement": "need",
-            "prioritize": "focus on",
-            "fundamental": "basic",
-            "endeavor": "try"
-        }
-        
-        result = text
-        for complex_word, simple_word in replacements.items():
-            result = re.sub(r'\b' + complex_word + r'\b', simple_word, result, flags=re.IGNORECASE)
+        # Replace complex words with simpler alternatives in a single pass
+        result = self._REPLACEMENT_RE.sub(lambda m: self._REPLACEMENTS[m.group(1).lower()], text)
             
         # Split very long sentences
-        sentences = re.split(r'([.!?])', text)
         simplified_sentences = []
         
-        for i in range(0, len(sentences), 2):
-            if i+1 < len(sentences):
-                sentence = sentences[i] + sentences[i+1]
-            else:
-                sentence = sentences[i]
+        for match in self._SENTENCE_RE.finditer(result):
+            sentence = match.group()
                 
             # If sentence is very long, try to split it
             if len(sentence.split()) > 25:
                 # Split on conjunctions or commas
-                parts = re.split(r',\s*|\s+and\s+|\s+but\s+|\s+or\s+|\s+so\s+|\s+because\s+', sentence)
+                parts = self._CLAUSE_SPLIT_RE.split(sentence)
                 parts = [p for p in parts if p.strip()]
                 
                 if len(parts) > 1:
@@ -89,20 +150,22 @@ class TextSimplifier:
         
     def simplify_text(self, text, max_retries=2):
         """Simplify complex text for better accessibility"""
-        if not text or len(text) < 10:
+        # Skip simplification for very simple texts
+        if not self._needs_api(text):
             return text
             
-        try:
-            # Skip simplification for very simple texts
-            words = text.split()
-            if not words:
-                return text
-                
-            avg_word_length = sum(len(word) for word in words) / len(words)
+        cache_key = self._cache_key(text)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
             
-            if avg_word_length < 5 and len(words) < 20:
-                return text
-                
+        # Skip the model when the rule-based simplification is already good enough
+        quick = self._quick_simplify(text)
+        if quick is not None:
+            self._cache_put(cache_key, quick)
+            return quick
+            
+        try:
             # Prepare prompt for the model
             prompt = f"""
             Rewrite the following text to make it more accessible and easier to understand.
@@ -117,29 +180,44 @@ class TextSimplifier:
             # Make request to Ollama API
             for attempt in range(max_retries + 1):
                 try:
-                    response = requests.post(
+                    response = self.session.post(
                         self.api_url,
                         json={
                             "model": self.model_name,
                             "prompt": prompt,
-                            "stream": False,
+                            "stream": True,
                             "options": {
                                 "temperature": 0.1,
-                                "num_predict": 100
+                                # The simplified text shouldn't be longer than the original
+                                "num_predict": min(200, max(32, len(text) // 2)),
+                                "num_ctx": self._NUM_CTX,
+                                # Stop at the first blank line after the answer
+                                "stop": ["\n\n"]
                             }
                         },
-                        timeout=30
+                        timeout=30,
+                        stream=True
                     )
                     
-                    if response.status_code == 200:
-                        simplified_text = response.json().get("response", "").strip()
+                    if response.status_code != 200:
+                        response.close()
+                    else:
+                        # Stop reading once the reply is longer than we'd keep
+                        simplified_text = self._read_stream(response, len(text) * 1.2)
+                        if simplified_text is None:
+                            # Cut off mid-sentence, so don't put the fragment on the slide
+                            simplified_text = self.basic_simplify(text)
+                        if not simplified_text:
+                            return text
                         
                         # Ensure we don't make the text longer
-                        if len(simplified_text) > len(text) * 1.2:
-                            simplified_text = self._condense_text(simplified_text)
+                        simplified_text = self._fit_length(text, simplified_text)
                             
+                        self._cache_put(cache_key, simplified_text)
                         return simplified_text
                 except Exception as e:
+                    # Re-check the API next time instead of trusting the cached result
+                    self._api_ok_until = 0.0
                     if attempt < max_retries:
                         print(f"Retry {attempt+1} after error: {e}")
                         continue
@@ -151,58 +229,290 @@ class TextSimplifier:
             print(f"Error simplifying text: {e}")
             return text
     
+    def _quick_simplify(self, text):
+        """Return basic_simplify's result if it is already short and simple enough, else None"""
+        candidate = self.basic_simplify(text)
+        if len(candidate) <= len(text) * 0.85 and not self.is_text_complex(candidate):
+            return candidate
+        return None
+    
+    def _fit_length(self, text, simplified_text):
+        """Condense a reply that is longer than the original, keeping the shortest option if it stays too long"""
+        if len(simplified_text) > len(text) * 1.2:
+            simplified_text = self._condense_text(simplified_text)
+            if len(simplified_text) > len(text) * 1.2:
+                simplified_text = min((self.basic_simplify(text), simplified_text, text), key=len)
+        return simplified_text
+    
+    def _read_stream(self, response, limit):
+        """
+        Collect a streamed Ollama reply, stopping early once it grows past
+        limit characters; a cut-off reply is trimmed to its last full sentence,
+        or None is returned if it has no sentence end to trim to
+        """
+        chunks = []
+        length = 0
+        truncated = False
+        with response:
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                data = json.loads(line)
+                chunk = data.get("response", "")
+                chunks.append(chunk)
+                length += len(chunk)
+                if data.get("done"):
+                    break
+                if length > limit:
+                    truncated = True
+                    break
+        
+        text = "".join(chunks).strip()
+        if truncated:
+            end = max(text.rfind("."), text.rfind("!"), text.rfind("?"))
+            if end <= 0:
+                return None
+            text = text[:end + 1]
+        return text
+    
+    def _needs_api(self, text):
+        """Check whether text is complex enough to send to the model"""
+        if not text or len(text) < 10:
+            return False
+            
+        word_count, word_length = _text_stats(text)
+        if not word_count:
+            return False
+            
+        avg_word_length = word_length / word_count
+        return not (avg_word_length < 5 and word_count < 20)
+    
     def check_api_availability(self):
         """Check if the Ollama API is available"""
+        if time.monotonic() < self._api_ok_until:
+            return True
+            
         try:
-            response = requests.get("http://localhost:11434/api/health", timeout=5)
-            return response.status_code == 200
+            response = self.session.get("http://localhost:11434/api/health", timeout=5)
+            available = response.status_code == 200
         except:
-            return False
+            available = False
+            
+        if available:
+            self._api_ok_until = time.monotonic() + self._API_CHECK_TTL
+        return available
+            
+    @staticmethod
+    def _cache_key(text):
+        """Hash text into a compact cache key"""
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    
+    def _cache_get(self, key):
+        """Get a cached result and mark it as recently used"""
+        with self._cache_lock:
+            value = self._cache.get(key)
+            if value is not None:
+                self._cache.move_to_end(key)
+            return value
+    
+    def _cache_put(self, key, value):
+        """Store a result, evicting the least recently used one when full"""
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+    
+    def close(self):
+        """Close the pooled API connections"""
+        self.session.close()
             
     def _condense_text(self, text):
         """Condense text to be more concise"""
         # Remove redundant phrases
-        redundant_phrases = [
-            "it is important to note that",
-            "it should be noted that",
-            "it is worth mentioning that",
-            "as you can see",
-            "as shown above"
-        ]
-        
-        for phrase in redundant_phrases:
-            text = text.replace(phrase, "")
+        text = self._REDUNDANT_PHRASE_RE.sub("", text)
             
         # Remove excessive spaces
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = self._WHITESPACE_RE.sub(' ', text).strip()
         
         return text
     
+    def simplify_texts(self, texts):
+        """
+        Simplify several texts, keeping their order
+        
+        Single-line texts that need the model are packed into shared API requests
+        of up to _PACK_MAX_ITEMS texts, and the requests are sent concurrently.
+        """
+        texts = list(texts)
+        results = list(texts)
+        
+        # Only texts that aren't simple or already cached need a request, and
+        # repeated texts are sent once; map each to the positions it fills
+        pending = {}
+        for i, text in enumerate(texts):
+            if text in pending:
+                pending[text].append(i)
+                continue
+            if not self._needs_api(text):
+                continue
+            cached = self._cache_get(self._cache_key(text))
+            if cached is None:
+                cached = self._quick_simplify(text)
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending[text] = [i]
+        
+        batches = self._make_batches(list(pending))
+        if not batches:
+            return results
+        
+        workers = min(self.max_workers, len(batches))
+        if workers < 2:
+            simplified = [self._simplify_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                simplified = list(executor.map(self._simplify_batch, batches))
+        
+        flat = (text for batch in simplified for text in batch)
+        for positions, simplified_text in zip(pending.values(), flat):
+            for i in positions:
+                results[i] = simplified_text
+        return results
+    
+    def _make_batches(self, texts):
+        """
+        Group texts into consecutive batches within the packing limits
+        
+        Multi-line texts get a batch of their own, so they go through
+        simplify_text and keep their line breaks.
+        """
+        batches = []
+        batch = []
+        batch_chars = 0
+        for text in texts:
+            if len(text.splitlines()) > 1:
+                batches.append([text])
+                continue
+            if batch and (len(batch) >= self._PACK_MAX_ITEMS or
+                          batch_chars + len(text) > self._PACK_MAX_CHARS):
+                batches.append(batch)
+                batch = []
+                batch_chars = 0
+            batch.append(text)
+            batch_chars += len(text)
+        if batch:
+            batches.append(batch)
+        return batches
+    
+    def _simplify_batch(self, texts):
+        """Simplify a batch of texts, falling back to one request per text"""
+        if len(texts) == 1:
+            return [self.simplify_text(texts[0])]
+            
+        simplified = self._simplify_packed(texts)
+        if simplified is None:
+            return [self.simplify_text(text) for text in texts]
+        return simplified
+    
+    def _pack_batch(self, texts):
+        """Build one prompt asking the model to simplify each numbered text"""
+        lines = [
+            "Rewrite each of the following numbered texts to make it more accessible and easier to understand.",
+            "Use simpler words, shorter sentences, and clearer structure.",
+            "Keep the same meaning but make it more readable.",
+            "Return exactly one line per text in the format '<n>: <simplified text>'.",
+            ""
+        ]
+        # Only single-line texts are packed, so each stays on its numbered line
+        lines.extend(f"{n}: {text.strip()}" for n, text in enumerate(texts, 1))
+        return "\n".join(lines)
+    
+    def _simplify_packed(self, texts):
+        """Simplify several texts with one API request; None if the reply can't be matched up"""
+        try:
+            response = self.session.post(
+                self.api_url,
+                json={
+                    "model": self.model_name,
+                    "prompt": self._pack_batch(texts),
+                    "stream": False,
+                    "options": {
+                        "temperature": 0.1,
+                        "num_predict": min(self._NUM_CTX // 2, max(100, sum(map(len, texts)) // 2)),
+                        "num_ctx": self._NUM_CTX
+                    }
+                },
+                timeout=60
+            )
+            if response.status_code != 200:
+                return None
+            reply = response.json().get("response", "")
+        except Exception as e:
+            self._api_ok_until = 0.0
+            print(f"Error in batched simplification: {e}")
+            return None
+        
+        # Parse the numbered lines and require exactly one answer per text
+        answers = {}
+        for num, line in self._NUMBERED_LINE_RE.findall(reply):
+            answers[int(num)] = line.strip()
+        if sorted(answers) != list(range(1, len(texts) + 1)) or not all(answers.values()):
+            return None
+        
+        results = []
+        for n, text in enumerate(texts, 1):
+            # Ensure we don't make the text longer
+            simplified_text = self._fit_length(text, answers[n])
+                
+            self._cache_put(self._cache_key(text), simplified_text)
+            results.append(simplified_text)
+        return results
+    
     def batch_simplify_text(self, text_data_list):
         """Simplify multiple text items"""
         results = {}
+        pending = []
         
         for text_data in text_data_list:
             key = f"{text_data['slide_num']}_{text_data.get('shape_idx', 0)}"
             
             # Only simplify complex text
             text = text_data.get("text", "")
-            words = text.split()
+            word_count, word_length = _text_stats(text)
             complex_text = False
             
-            if words:
-                avg_word_length = sum(len(word) for word in words) / len(words)
-                if avg_word_length > 6 or len(words) > 25:
+            if word_count:
+                avg_word_length = word_length / word_count
+                if avg_word_length > 6 or word_count > 25:
                     complex_text = True
             
             if complex_text:
-                simplified = self.simplify_text(text)
-            else:
-                simplified = text  # No need to simplify
+                pending.append((key, text))
             
             results[key] = {
                 "original": text,
-                "simplified": simplified
+                "simplified": text  # No need to simplify
             }
+        
+        # Send the complex texts to the API together
+        simplified = self.simplify_texts(text for _, text in pending)
+        for (key, _), simplified_text in zip(pending, simplified):
+            results[key]["simplified"] = simplified_text
             
-        return results 
\ No newline at end of file
+        return results
+
+# Shared simplifiers by (model_name, api_url), so the connection pool and
+# result cache are reused across calls
+_simplifiers = {}
+_simplifiers_lock = threading.Lock()
+
+def get_simplifier(model_name="llama3", api_url="http://localhost:11434/api/generate"):
+    """Get the shared TextSimplifier for a model and API URL"""
+    key = (model_name, api_url)
+    with _simplifiers_lock:
+        simplifier = _simplifiers.get(key)
+        if simplifier is None:
+            simplifier = _simplifiers[key] = TextSimplifier(model_name, api_url)
+        return simplifier
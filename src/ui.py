@@ -4,11 +4,19 @@ Handles display of UI elements and layouts.
 """
 
 import streamlit as st
+import html
 import os
+import re
+import string
+import threading
+import traceback
+from pathlib import Path
+from src.alt_text_generator import get_alt_text_generator
+from src.enhancement import enhance_presentation_simple
+from src.ppt_processor import PPTProcessor
 
-def load_css():
-    """Load custom CSS styles"""
-    st.markdown("""
+# Custom CSS, built once at import and re-sent by load_css on each rerun
+_CSS = """
     <style>
         .main .block-container {
             padding-top: 2rem;
@@ -29,63 +37,213 @@ def load_css():
             font-weight: 600;
         }
         
-        /* Score display styling */
-        .score-display {
+        /* Feature cards on the landing page */
+        .feature-card {
             text-align: center;
-            padding: 20px;
-            background-color: #f8f9fa;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+            padding: 15px;
+            background-color: white;
+            border-radius: 8px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.1);
+        }
+        
+        .feature-card h4 {
+            color: #1565C0;
+            margin-top: 0;
+        }
+        
+        .feature-card p {
+            color: #555;
+        }
+        
+        .feature-grid {
+            display: flex;
+            gap: 1rem;
+        }
+        
+        .feature-grid > div {
+            flex: 1;
+        }
+        
+        /* Enhancement option cards */
+        .option-card {
+            background-color: white;
+            border-radius: 8px;
+            padding: 15px;
+            margin-bottom: 15px;
+            box-shadow: 0 2px 5px rgba(0,0,0,0.05);
+        }
+        
+        .option-card h4 {
+            margin-top: 0;
+            color: #1565C0;
+        }
+        
+        .option-card p {
+            color: #555;
+            font-size: 0.9rem;
         }
         
-        /* Custom card styling */
-        .card {
-            padding: 20px;
-            border-radius: 10px;
+        /* Presentation summary cards */
+        .summary-cards {
+            display: flex;
+            flex-wrap: wrap;
+            gap: 10px;
             margin-bottom: 20px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.05);
         }
         
-        .card-green {
-            background-color: #E8F5E9;
+        .summary-card {
+            flex: 1;
+            min-width: 200px;
+            padding: 15px;
+            border-radius: 8px;
         }
         
-        .card-blue {
-            background-color: #E3F2FD;
+        .summary-card h4 {
+            margin-top: 0;
         }
         
-        .card-orange {
-            background-color: #FFF3E0;
+        .summary-value {
+            font-size: 20px;
+            font-weight: bold;
         }
         
-        /* Button styling */
-        .primary-button {
-            background-color: #4CAF50;
-            color: white;
-            padding: 10px 15px;
+        .summary-note {
+            font-size: 14px;
+            color: #555;
+        }
+        
+        /* Issue listings */
+        .issue-card {
+            padding: 10px;
+            border-radius: 5px;
+            margin-bottom: 10px;
+        }
+        
+        .issue-row {
+            background-color: white;
             border-radius: 4px;
-            text-align: center;
-            text-decoration: none;
-            display: inline-block;
-            font-size: 16px;
-            margin: 4px 2px;
-            cursor: pointer;
-            border: none;
+            padding: 10px;
+            margin-bottom: 8px;
+            box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+            color: #000000;
         }
-    </style>
-    """, unsafe_allow_html=True)
+        
+        /* Category score cards in one row */
+        .score-grid {
+            display: flex;
+            gap: 10px;
+            margin-bottom: 1rem;
+        }
+        
+        .score-grid > div {
+            flex: 1;
+        }
+            </style>
+    """
+# Minify once at import so less text is sent and parsed per rerun: drop the
+# comments, indentation and line breaks, then the spaces around punctuation
+_CSS = re.sub(r"/\*.*?\*/", "", _CSS, flags=re.S)
+_CSS = "".join(line.strip() for line in _CSS.splitlines())
+_CSS = re.sub(r"\s*([{};:,>])\s*", r"\1", _CSS)
+
+def load_css():
+    """Load custom CSS styles"""
+    st.markdown(_CSS, unsafe_allow_html=True)
+    _start_prewarm()
+
+def _prewarm():
+    """Import plotly ahead of time so the first results view doesn't pay for it"""
+    try:
+        import plotly.graph_objects  # noqa: F401
+    except ImportError:
+        pass
+
+@st.cache_resource
+def _start_prewarm():
+    """Start the import prewarm on a background thread, once per process"""
+    threading.Thread(target=_prewarm, daemon=True).start()
+
+# Resolved against this module rather than the working directory, once at import
+_IMAGES_DIR = Path(__file__).resolve().parent / "images"
 
 def get_image_path(image_name):
     """Get the path to an image in the src/images directory"""
-    return os.path.join("src", "images", image_name)
+    return str(_IMAGES_DIR / image_name)
+
+# Score categories and their display labels, in display order
+_CATS = (
+    ("alt_text", "Alt Text"),
+    ("font_size", "Font Size"),
+    ("contrast", "Contrast"),
+    ("text_complexity", "Text Complexity"),
+)
+
+# Icons for each WCAG criteria type
+_CRITERIA_ICONS = {
+    "1.1.1 Non-text Content": "🖼️",
+    "1.4.3 Contrast": "👁️",
+    "1.4.4 Resize Text": "🔍",
+    "3.1.5 Reading Level": "📝"
+}
+
+# Criteria colors for better visibility against white background
+_CRITERIA_COLORS = {
+    "1.1.1 Non-text Content": "#1565C0",  # Deep blue
+    "1.4.3 Contrast": "#6A1B9A",  # Purple
+    "1.4.4 Resize Text": "#AD1457",  # Pink
+    "3.1.5 Reading Level": "#2E7D32"   # Green
+}
+
+# Images the UI shows when they are present
+_UI_IMAGES = (
+    "accessibility_logo.png",
+    "upload_icon.png",
+    "alt_text_feature.png",
+    "contrast_feature.png",
+    "simplify_feature.png",
+)
+
+@st.cache_resource
+def _alt_text_generator():
+    """Get the shared AltTextGenerator used for the Ollama status checks"""
+    return get_alt_text_generator()
+
+@st.cache_data(ttl=10)
+def _ollama_status():
+    """
+    Probe Ollama for the enhancement options warning, at most every 10 seconds
+    
+    Returns:
+        tuple: (api_available, port_free); the port is only checked when the
+        API is unavailable and is reported free otherwise
+    """
+    generator = _alt_text_generator()
+    if generator.check_api_availability():
+        return True, True
+    return False, generator.check_port_availability()
+
+@st.cache_resource(max_entries=8)
+def _file_bytes(path, mtime):
+    """Read a file once per (path, mtime); bytes are immutable so sharing the result is safe"""
+    with open(path, "rb") as f:
+        return f.read()
+
+@st.cache_resource
+def _image_index():
+    """Map each UI image that exists on disk to its path, with one directory read per process"""
+    if not _IMAGES_DIR.is_dir():
+        return {}
+    with os.scandir(_IMAGES_DIR) as entries:
+        available = {entry.name for entry in entries if entry.is_file()}
+    return {name: get_image_path(name) for name in _UI_IMAGES if name in available}
 
 def display_header():
     """Display the application header with logo"""
     col1, col2 = st.columns([1, 3])
 
     # Check if the logo image exists and display it
-    logo_path = get_image_path("accessibility_logo.png")
-    if os.path.exists(logo_path):
+    logo_path = _image_index().get("accessibility_logo.png")
+    if logo_path:
         col1.image(logo_path, width=150)
     else:
         # Fallback icon if image doesn't exist
@@ -102,61 +260,49 @@ def display_upload_section():
         <h2 style="color: #2E7D32; margin-top: 40px;">Start by Uploading Your Presentation</h2>
     """, unsafe_allow_html=True)
 
-    # Check if the upload icon exists
-    upload_icon_path = get_image_path("upload_icon.png")
-    if os.path.exists(upload_icon_path):
+    # Check if the upload icon exists; st.image serves it as a media file the browser caches
+    upload_icon_path = _image_index().get("upload_icon.png")
+    if upload_icon_path:
         col1, col2, col3 = st.columns([1, 2, 1])
-        with col2:
-            st.image(upload_icon_path, width=80)
+        col2.image(upload_icon_path, width=80)
 
     # Return the uploaded file
     return st.file_uploader("Choose a PowerPoint file (.pptx)", type=["pptx"], label_visibility="collapsed")
 
+# (image, title, description) for each card in the features section
+_FEATURES = (
+    ("alt_text_feature.png", "Alt Text Generation",
+     "AI-powered descriptions for images to improve screen reader compatibility"),
+    ("contrast_feature.png", "Font & Contrast Fixing",
+     "Ensure text is readable with proper font sizes and contrast ratios"),
+    ("simplify_feature.png", "Text Simplification",
+     "Make complex text more readable for improved comprehension"),
+)
+
+@st.cache_resource
+def _features_html():
+    """Build the feature cards as one HTML grid, once per process"""
+    cards = "".join(
+        f'<div class="feature-card"><h4>{title}</h4><p>{description}</p></div>'
+        for _, title, description in _FEATURES
+    )
+    return f'<div class="feature-grid">{cards}</div>'
+
 def display_features_section():
     """Display the features section when no file is uploaded"""
     st.markdown("""
     <h3 style="color: #2E7D32; margin-top: 50px; margin-bottom: 30px;">Key Features</h3>
     """, unsafe_allow_html=True)
     
-    feature_cols = st.columns(3)
+    # Feature images go through st.image so the browser can cache them as media
+    images = _image_index()
+    if any(image_name in images for image_name, _, _ in _FEATURES):
+        for col, (image_name, _, _) in zip(st.columns(len(_FEATURES)), _FEATURES):
+            if image_name in images:
+                col.image(images[image_name], width=200)
     
-    # Try to get feature images
-    alt_text_img = get_image_path("alt_text_feature.png")
-    contrast_img = get_image_path("contrast_feature.png")
-    simplify_img = get_image_path("simplify_feature.png")
-    
-    # Feature 1: Alt Text
-    with feature_cols[0]:
-        if os.path.exists(alt_text_img):
-            st.image(alt_text_img, use_column_width=True)
-        st.markdown("""
-        <div style="text-align: center; padding: 15px; background-color: white; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-            <h4 style="color: #1565C0; margin-top: 0;">Alt Text Generation</h4>
-            <p style="color: #555;">AI-powered descriptions for images to improve screen reader compatibility</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Feature 2: Font & Contrast
-    with feature_cols[1]:
-        if os.path.exists(contrast_img):
-            st.image(contrast_img, use_column_width=True)
-        st.markdown("""
-        <div style="text-align: center; padding: 15px; background-color: white; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-            <h4 style="color: #1565C0; margin-top: 0;">Font & Contrast Fixing</h4>
-            <p style="color: #555;">Ensure text is readable with proper font sizes and contrast ratios</p>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    # Feature 3: Text Simplification
-    with feature_cols[2]:
-        if os.path.exists(simplify_img):
-            st.image(simplify_img, use_column_width=True)
-        st.markdown("""
-        <div style="text-align: center; padding: 15px; background-color: white; border-radius: 8px; box-shadow: 0 2px 5px rgba(0,0,0,0.1);">
-            <h4 style="color: #1565C0; margin-top: 0;">Text Simplification</h4>
-            <p style="color: #555;">Make complex text more readable for improved comprehension</p>
-        </div>
-        """, unsafe_allow_html=True)
+    # The cards are static, so they go out as a single cached block
+    st.markdown(_features_html(), unsafe_allow_html=True)
 
 def display_upload_placeholder():
     """Display a placeholder when no file is uploaded"""
@@ -170,74 +316,97 @@ def display_upload_placeholder():
     </div>
     """, unsafe_allow_html=True)
 
-def display_analysis_results(before_score, wcag_report):
-    """Display accessibility analysis results"""
-    
-    if not before_score or not wcag_report:
-        st.error("No analysis results available.")
-        return
-    
+# Presentation summary cards for display_analysis_results
+_SUMMARY_TEMPLATE = string.Template("""
+            <div class="summary-cards">
+                <div class="summary-card" style="background-color: #f1f8e9;">
+                    <h4 style="color: #2E7D32;">Slides</h4>
+                    <p class="summary-value">$slides</p>
+                </div>
+                <div class="summary-card" style="background-color: #e1f5fe;">
+                    <h4 style="color: #0277BD;">Images</h4>
+                    <p class="summary-value">$images</p>
+                    <p class="summary-note">$missing_alt missing alt text</p>
+                </div>
+                <div class="summary-card" style="background-color: #fff3e0;">
+                    <h4 style="color: #E65100;">Font Issues</h4>
+                    <p class="summary-value">$small_fonts slides</p>
+                    <p class="summary-note">with small fonts</p>
+                </div>
+                <div class="summary-card" style="background-color: #e8eaf6;">
+                    <h4 style="color: #303F9F;">Text Complexity</h4>
+                    <p class="summary-value">$complex_text slides</p>
+                    <p class="summary-note">with complex text</p>
+                </div>
+            </div>
+            """)
+
+# Summary report fields shown in the summary card
+_SUMMARY_FIELDS = ("total_slides", "total_images", "images_missing_alt_text",
+                   "slides_with_small_fonts", "slides_with_complex_text")
+
+def _analysis_html(before_score, wcag_report):
+    """Build the score banner, category grid and summary card HTML for the analysis results"""
     # Display the overall score prominently
     score_color = "#4CAF50" if before_score["overall_score"] >= 80 else "#FF9800" if before_score["overall_score"] >= 60 else "#F44336"
     
     # Create accessibility score section with improved visuals
-    st.markdown(
-        f"""
+    score_html = f"""
         <div style="background-color: #f8f9fa; padding: 20px; border-radius: 8px; margin-bottom: 20px;">
             <h2 style="margin-top: 0;">Accessibility Score: <span style="color: {score_color};">{before_score["overall_score"]}/100</span></h2>
             <p style="color: #555; margin-top: 0;">Your presentation has been analyzed for accessibility compliance.</p>
         </div>
-        """, 
-        unsafe_allow_html=True
+        """
+    
+    category_scores = before_score["category_scores"]
+    grid_html = (
+        '<div class="score-grid">'
+        + "".join(_score_card_html(label, category_scores[key]) for key, label in _CATS)
+        + "</div>"
+    )
+    
+    summary_html = None
+    if "summary" in wcag_report:
+        summary = wcag_report["summary"]
+        summary_html = _SUMMARY_TEMPLATE.substitute(
+            slides=summary.get("total_slides", 0),
+            images=summary.get("total_images", 0),
+            missing_alt=summary.get("images_missing_alt_text", 0),
+            small_fonts=summary.get("slides_with_small_fonts", 0),
+            complex_text=summary.get("slides_with_complex_text", 0)
+        )
+    return score_html, grid_html, summary_html
+
+def display_analysis_results(before_score, wcag_report):
+    """Display accessibility analysis results"""
+    
+    if not before_score or not wcag_report:
+        st.error("No analysis results available.")
+        return
+    
+    # Rebuild the HTML only when different results are shown, keyed on the
+    # values the HTML is built from
+    summary = wcag_report.get("summary")
+    key = (
+        before_score["overall_score"],
+        tuple(before_score["category_scores"][cat] for cat, _ in _CATS),
+        tuple(summary.get(field, 0) for field in _SUMMARY_FIELDS) if summary is not None else None,
     )
+    if st.session_state.get("_last_analysis_key") != key:
+        st.session_state._last_analysis_html = _analysis_html(before_score, wcag_report)
+        st.session_state._last_analysis_key = key
+    score_html, grid_html, summary_html = st.session_state._last_analysis_html
     
-    # Create columns for different scores
-    col1, col2, col3, col4 = st.columns(4)
+    st.markdown(score_html, unsafe_allow_html=True)
     
-    # Display category scores
-    with col1:
-        display_category_score("Alt Text", before_score["category_scores"]["alt_text"])
-        
-    with col2:
-        display_category_score("Font Size", before_score["category_scores"]["font_size"])
-        
-    with col3:
-        display_category_score("Contrast", before_score["category_scores"]["contrast"])
-        
-    with col4:
-        display_category_score("Text Complexity", before_score["category_scores"]["text_complexity"])
+    # Display category scores in a single grid
+    st.markdown(grid_html, unsafe_allow_html=True)
     
     # Show summary statistics from the WCAG report
     st.markdown("### Presentation Summary")
     
-    if "summary" in wcag_report:
-        summary = wcag_report["summary"]
-        st.markdown(
-            f"""
-            <div style="display: flex; flex-wrap: wrap; gap: 10px; margin-bottom: 20px;">
-                <div style="flex: 1; min-width: 200px; background-color: #f1f8e9; padding: 15px; border-radius: 8px;">
-                    <h4 style="margin-top: 0; color: #2E7D32;">Slides</h4>
-                    <p style="font-size: 20px; font-weight: bold;">{summary.get("total_slides", 0)}</p>
-                </div>
-                <div style="flex: 1; min-width: 200px; background-color: #e1f5fe; padding: 15px; border-radius: 8px;">
-                    <h4 style="margin-top: 0; color: #0277BD;">Images</h4>
-                    <p style="font-size: 20px; font-weight: bold;">{summary.get("total_images", 0)}</p>
-                    <p style="font-size: 14px; color: #555;">{summary.get("images_missing_alt_text", 0)} missing alt text</p>
-                </div>
-                <div style="flex: 1; min-width: 200px; background-color: #fff3e0; padding: 15px; border-radius: 8px;">
-                    <h4 style="margin-top: 0; color: #E65100;">Font Issues</h4>
-                    <p style="font-size: 20px; font-weight: bold;">{summary.get("slides_with_small_fonts", 0)} slides</p>
-                    <p style="font-size: 14px; color: #555;">with small fonts</p>
-                </div>
-                <div style="flex: 1; min-width: 200px; background-color: #e8eaf6; padding: 15px; border-radius: 8px;">
-                    <h4 style="margin-top: 0; color: #303F9F;">Text Complexity</h4>
-                    <p style="font-size: 20px; font-weight: bold;">{summary.get("slides_with_complex_text", 0)} slides</p>
-                    <p style="font-size: 14px; color: #555;">with complex text</p>
-                </div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
+    if summary_html is not None:
+        st.markdown(summary_html, unsafe_allow_html=True)
     
     # Display detailed issues
     with st.expander("View Detailed Accessibility Issues"):
@@ -247,60 +416,54 @@ def display_analysis_results(before_score, wcag_report):
             # Alt text issues
             if issues.get("alt_text"):
                 st.markdown("#### Alternative Text Issues")
-                for issue in issues["alt_text"]:
-                    st.markdown(
-                        f"""
-                        <div style="background-color: #ffebee; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                            <strong>Slide {issue['slide_num'] + 1}:</strong> {issue['issue']}
-                            <br/><small>{issue.get('description', '')}</small>
-                        </div>
-                        """, 
-                        unsafe_allow_html=True
-                    )
+                st.markdown(_issue_cards_html(issues["alt_text"], "#ffebee", "description"),
+                            unsafe_allow_html=True)
             
             # Font size issues
             if issues.get("font_size"):
                 st.markdown("#### Font Size Issues")
-                for issue in issues["font_size"]:
-                    st.markdown(
-                        f"""
-                        <div style="background-color: #fff8e1; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                            <strong>Slide {issue['slide_num'] + 1}:</strong> {issue['issue']}
-                            <br/><small>{issue.get('recommendation', '')}</small>
-                            <br/><small>Text: "{issue.get('text', '')}"</small>
-                        </div>
-                        """, 
-                        unsafe_allow_html=True
-                    )
+                st.markdown(_issue_cards_html(issues["font_size"], "#fff8e1", "recommendation", show_text=True),
+                            unsafe_allow_html=True)
             
             # Contrast issues
             if issues.get("contrast"):
                 st.markdown("#### Contrast Issues")
-                for issue in issues["contrast"]:
-                    st.markdown(
-                        f"""
-                        <div style="background-color: #e3f2fd; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                            <strong>Slide {issue['slide_num'] + 1}:</strong> {issue['issue']}
-                            <br/><small>{issue.get('description', '')}</small>
-                        </div>
-                        """, 
-                        unsafe_allow_html=True
-                    )
+                st.markdown(_issue_cards_html(issues["contrast"], "#e3f2fd", "description"),
+                            unsafe_allow_html=True)
             
             # Text complexity issues
             if issues.get("text_complexity"):
                 st.markdown("#### Text Complexity Issues")
-                for issue in issues["text_complexity"]:
-                    st.markdown(
-                        f"""
-                        <div style="background-color: #e8f5e9; padding: 10px; border-radius: 5px; margin-bottom: 10px;">
-                            <strong>Slide {issue['slide_num'] + 1}:</strong> {issue['issue']}
-                            <br/><small>{issue.get('suggestion', '')}</small>
-                            <br/><small>Text: "{issue.get('text', '')}"</small>
-                        </div>
-                        """, 
-                        unsafe_allow_html=True
-                    )
+                st.markdown(_issue_cards_html(issues["text_complexity"], "#e8f5e9", "suggestion", show_text=True),
+                            unsafe_allow_html=True)
+
+# One issue card, kept on one line so the cards join into one HTML block
+_ISSUE_CARD_TEMPLATE = (
+    '<div class="issue-card" style="background-color: {bg_color};">'
+    '<strong>Slide {slide}:</strong> {issue}<br/><small>{detail}</small>{text}</div>'
+)
+_ISSUE_TEXT_TEMPLATE = '<br/><small>Text: &quot;{text}&quot;</small>'
+
+@st.cache_data
+def _issue_cards_html(issues, bg_color, detail_key, show_text=False):
+    """Build the escaped HTML for one category's issue cards, once per distinct report"""
+    escape = html.escape
+    cards = []
+    for issue in issues:
+        text = _ISSUE_TEXT_TEMPLATE.format(text=escape(str(issue.get('text', '')))) if show_text else ""
+        cards.append(_ISSUE_CARD_TEMPLATE.format(
+            bg_color=bg_color,
+            slide=issue['slide_num'] + 1,
+            issue=escape(str(issue['issue'])),
+            detail=escape(str(issue.get(detail_key, ''))),
+            text=text
+        ))
+    return "\n".join(cards)
+
+@st.cache_data
+def _issue_rows_html(issues):
+    """Build the escaped HTML for one criterion's issue rows, once per distinct list"""
+    return "\n".join(f'<div class="issue-row">• {html.escape(issue)}</div>' for issue in issues)
 
 def display_issues_section(wcag_report):
     """Display the identified issues section"""
@@ -308,29 +471,13 @@ def display_issues_section(wcag_report):
 
     has_issues = False
     if wcag_report:
-        # Define icons for each criteria type
-        icons = {
-            "1.1.1 Non-text Content": "🖼️",
-            "1.4.3 Contrast": "👁️",
-            "1.4.4 Resize Text": "🔍",
-            "3.1.5 Reading Level": "📝"
-        }
-        
-        # Define criteria colors for better visibility against white background
-        criteria_colors = {
-            "1.1.1 Non-text Content": "#1565C0",  # Deep blue
-            "1.4.3 Contrast": "#6A1B9A",  # Purple
-            "1.4.4 Resize Text": "#AD1457",  # Pink
-            "3.1.5 Reading Level": "#2E7D32"   # Green
-        }
-        
         for criteria, details in wcag_report.items():
             if details["issues"]:
                 has_issues = True
-                icon = icons.get(criteria, "⚠️")
+                icon = _CRITERIA_ICONS.get(criteria, "⚠️")
                 
                 # Get custom color for this criteria or fallback to dark gray
-                criteria_color = criteria_colors.get(criteria, "#424242")
+                criteria_color = _CRITERIA_COLORS.get(criteria, "#424242")
                 
                 # Determine compliance status color
                 badge_color = "#4CAF50" if details["compliance"] == "Pass" else "#F44336"
@@ -345,14 +492,8 @@ def display_issues_section(wcag_report):
                     </div>
                     """, unsafe_allow_html=True)
                         
-                    # Display each issue with a bullet point
-                    for issue in details["issues"]:
-                        st.markdown(f"""
-                        <div style="background-color: white; border-radius: 4px; padding: 10px; 
-                                  margin-bottom: 8px; box-shadow: 0 1px 3px rgba(0,0,0,0.1); color: #000000;">
-                            • {issue}
-                        </div>
-                        """, unsafe_allow_html=True)
+                    # Display each issue with a bullet point, all rows in one element
+                    st.markdown(_issue_rows_html(details["issues"]), unsafe_allow_html=True)
 
         if not has_issues:
             st.success("✅ No accessibility issues found! Your presentation is already well-optimized.")
@@ -366,27 +507,26 @@ def display_enhancement_options():
     
     with col1:
         st.markdown("""
-        <div style="background-color: white; border-radius: 8px; padding: 15px; margin-bottom: 15px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-            <h4 style="margin-top: 0; color: #1565C0;">Image Accessibility</h4>
-            <p style="color: #555; font-size: 0.9rem;">Generate alternative text descriptions for images using LLaVA via Ollama to make them accessible to screen readers.</p>
+        <div class="option-card">
+            <h4>Image Accessibility</h4>
+            <p>Generate alternative text descriptions for images using LLaVA via Ollama to make them accessible to screen readers.</p>
         </div>
         """, unsafe_allow_html=True)
         generate_alt_text = st.checkbox("Generate Alt Text for Images", value=True)
         
         st.markdown("""
-        <div style="background-color: white; border-radius: 8px; padding: 15px; margin-bottom: 15px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-            <h4 style="margin-top: 0; color: #1565C0;">Font Accessibility</h4>
-            <p style="color: #555; font-size: 0.9rem;">Increase font sizes to ensure readability for all users, including those with visual impairments.</p>
+        <div class="option-card">
+            <h4>Font Accessibility</h4>
+            <p>Increase font sizes to ensure readability for all users, including those with visual impairments.</p>
         </div>
         """, unsafe_allow_html=True)
         fix_font_size = st.checkbox("Fix Small Font Sizes", value=True)
         
         # Display warning if Ollama is not installed or running
         try:
-            from src.alt_text_generator import AltTextGenerator
-            generator = AltTextGenerator()
-            if not generator.check_api_availability():
-                if hasattr(generator, 'check_port_availability') and not generator.check_port_availability():
+            api_available, port_free = _ollama_status()
+            if not api_available:
+                if not port_free:
                     st.error("""
                         ⚠️ Port 11434 is in use by another application. 
                         Please close any other Ollama instances or applications using this port.
@@ -406,17 +546,17 @@ def display_enhancement_options():
     
     with col2:
         st.markdown("""
-        <div style="background-color: white; border-radius: 8px; padding: 15px; margin-bottom: 15px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-            <h4 style="margin-top: 0; color: #1565C0;">Color Contrast</h4>
-            <p style="color: #555; font-size: 0.9rem;">Improve text-to-background contrast to meet WCAG standards for better readability.</p>
+        <div class="option-card">
+            <h4>Color Contrast</h4>
+            <p>Improve text-to-background contrast to meet WCAG standards for better readability.</p>
         </div>
         """, unsafe_allow_html=True)
         improve_contrast = st.checkbox("Fix Color Contrast Issues", value=True)
         
         st.markdown("""
-        <div style="background-color: white; border-radius: 8px; padding: 15px; margin-bottom: 15px; box-shadow: 0 2px 5px rgba(0,0,0,0.05);">
-            <h4 style="margin-top: 0; color: #1565C0;">Text Simplification</h4>
-            <p style="color: #555; font-size: 0.9rem;">Simplify complex language to improve readability and comprehension using AI assistance.</p>
+        <div class="option-card">
+            <h4>Text Simplification</h4>
+            <p>Simplify complex language to improve readability and comprehension using AI assistance.</p>
         </div>
         """, unsafe_allow_html=True)
         simplify_text = st.checkbox("Simplify Complex Text", value=True)
@@ -435,8 +575,6 @@ def display_enhancement_options():
 
 def display_enhance_button_and_process(generate_alt_text, fix_font_size=True, improve_contrast=True, simplify_text=True):
     """Display the enhance button and handle the enhancement process"""
-    from src.enhancement import enhance_presentation_simple
-    
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         # Clear previous state tracking variables
@@ -446,17 +584,24 @@ def display_enhance_button_and_process(generate_alt_text, fix_font_size=True, im
         # Simple button that sets a flag when pressed
         if st.button("🚀 Enhance Presentation", key="enhance_simple_btn", type="primary", use_container_width=True):
             st.session_state.enhance_button_pressed = True
+            st.session_state.pop('last_error', None)
+            st.session_state.pop('last_error_tb', None)
+        
+        # After a failure, show the stored error until the user retries
+        if st.session_state.get('last_error_tb'):
+            st.error(st.session_state.last_error)
+            st.error(st.session_state.last_error_tb)
+            st.button("Try again", key="retry_error_btn", on_click=_retry_enhancement)
         
         # The enhancement process runs when the flag is set
-        if st.session_state.enhance_button_pressed:
+        elif st.session_state.enhance_button_pressed:
             try:
                 with st.spinner("⚙️ Enhancing presentation..."):
                     # Ensure the ppt_processor is in the session state
                     if 'ppt_processor' not in st.session_state or st.session_state.ppt_processor is None:
-                        # If not, create a new one
-                        from src.ppt_processor import PPTProcessor
+                        # If not, create a new one; enhancement loads the deck itself
+                        # from its output copy, so parsing the input here would be wasted
                         st.session_state.ppt_processor = PPTProcessor()
-                        st.session_state.ppt_processor.load_presentation(st.session_state.input_path)
                     
                     # Call enhancement function with explicit parameter list and processor
                     after_score = enhance_presentation_simple(
@@ -485,9 +630,15 @@ def display_enhance_button_and_process(generate_alt_text, fix_font_size=True, im
                             st.experimental_rerun()
                     
             except Exception as e:
-                st.error(f"Error enhancing presentation: {str(e)}")
-                import traceback
-                st.error(traceback.format_exc())
+                # Format the traceback once and keep it for the following reruns
+                st.session_state.last_error = f"Error enhancing presentation: {str(e)}"
+                st.session_state.last_error_tb = traceback.format_exc()
+                st.error(st.session_state.last_error)
+                st.error(st.session_state.last_error_tb)
+
+# Markdown lines for the category scores in the enhancement results
+_BEFORE_SCORE_LINE = "**{label}:** {score}/100"
+_IMPROVED_SCORE_LINE = "**{label}:** {score}/100 <span style='color:green'>(+{improvement})</span>"
 
 def display_enhancement_results(after_score):
     """Display the enhancement results with before and after comparison"""
@@ -517,6 +668,12 @@ def display_enhancement_results(after_score):
         before_overall = before_score.get("overall_score", 0)
         after_overall = after_score.get("overall_score", 0)
         
+        # Pair up the before and after score of each category once
+        before_cat_scores = before_score.get("category_scores", {})
+        after_cat_scores = after_score.get("category_scores", {})
+        cat_scores = [(label, before_cat_scores.get(key, 0), after_cat_scores.get(key, 0))
+                      for key, label in _CATS]
+        
         with col1:
             st.markdown("<h4>Before Enhancement</h4>", unsafe_allow_html=True)
             
@@ -528,12 +685,10 @@ def display_enhancement_results(after_score):
             )
             st.plotly_chart(before_fig, use_container_width=True)
             
-            # Display category scores
+            # Display category scores, all lines in one element
             st.markdown("#### Category Scores")
-            before_cat_scores = before_score.get("category_scores", {})
-            for cat in ["alt_text", "font_size", "contrast", "text_complexity"]:
-                score = before_cat_scores.get(cat, 0)
-                st.markdown(f"**{cat.replace('_', ' ').title()}:** {score}/100")
+            st.markdown("\n\n".join(_BEFORE_SCORE_LINE.format(label=label, score=score)
+                                    for label, score, _ in cat_scores))
         
         with col2:
             st.markdown("<h4>After Enhancement</h4>", unsafe_allow_html=True)
@@ -546,19 +701,14 @@ def display_enhancement_results(after_score):
             )
             st.plotly_chart(after_fig, use_container_width=True)
             
-            # Display category scores
+            # Display category scores with any improvement in color, all lines in one element
             st.markdown("#### Category Scores")
-            after_cat_scores = after_score.get("category_scores", {})
-            for cat in ["alt_text", "font_size", "contrast", "text_complexity"]:
-                after_score_val = after_cat_scores.get(cat, 0)
-                before_score_val = before_cat_scores.get(cat, 0)
+            lines = []
+            for label, before_score_val, after_score_val in cat_scores:
                 improvement = after_score_val - before_score_val
-                
-                # Calculate improvement and display with color
-                if improvement > 0:
-                    st.markdown(f"**{cat.replace('_', ' ').title()}:** {after_score_val}/100 <span style='color:green'>(+{improvement})</span>", unsafe_allow_html=True)
-                else:
-                    st.markdown(f"**{cat.replace('_', ' ').title()}:** {after_score_val}/100")
+                template = _IMPROVED_SCORE_LINE if improvement > 0 else _BEFORE_SCORE_LINE
+                lines.append(template.format(label=label, score=after_score_val, improvement=improvement))
+            st.markdown("\n\n".join(lines), unsafe_allow_html=True)
         
         # Display overall improvement
         improvement = after_overall - before_overall
@@ -567,21 +717,26 @@ def display_enhancement_results(after_score):
         else:
             st.info("No significant score improvement detected.")
             
-        # Only show download buttons if we have the enhanced file
-        if 'enhanced_file_path' in st.session_state and os.path.exists(st.session_state.enhanced_file_path):
+        # Only show download buttons if we have the enhanced file; one stat both
+        # checks that it exists and keys the cached bytes
+        enhanced_path = st.session_state.get('enhanced_file_path')
+        try:
+            enhanced_mtime = os.path.getmtime(enhanced_path) if enhanced_path else None
+        except OSError:
+            enhanced_mtime = None
+        if enhanced_mtime is not None:
             # Download buttons
             col1, col2 = st.columns(2)
             
             with col1:
-                with open(st.session_state.enhanced_file_path, "rb") as file:
-                    st.download_button(
-                        label="📥 Download Enhanced Presentation",
-                        data=file,
-                        file_name="enhanced_presentation.pptx",
-                        mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
-                        key="download_ppt_btn",
-                        use_container_width=True
-                    )
+                st.download_button(
+                    label="📥 Download Enhanced Presentation",
+                    data=_file_bytes(enhanced_path, enhanced_mtime),
+                    file_name="enhanced_presentation.pptx",
+                    mime="application/vnd.openxmlformats-officedocument.presentationml.presentation",
+                    key="download_ppt_btn",
+                    use_container_width=True
+                )
             
             with col2:
                 if 'report_html' in st.session_state and st.session_state.report_html:
@@ -596,21 +751,34 @@ def display_enhancement_results(after_score):
                 else:
                     st.info("HTML report not available for download.")
         
-        # Reset button
-        if st.button("Start Over", key="reset_btn"):
-            # Clear all relevant session state values
-            for key in ['enhance_button_pressed', 'after_score', 'report_html']:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.experimental_rerun()
+        # Reset button; the state is cleared in the click callback, before the
+        # rerun the click triggers, so no second rerun is needed
+        st.button("Start Over", key="reset_btn", on_click=_reset_enhancement)
             
     except Exception as e:
-        import traceback
         st.error(f"Error displaying enhancement results: {str(e)}")
         st.error(traceback.format_exc())
 
+def _retry_enhancement():
+    """Clear the stored error for the Try again button, keeping the enhance flag set"""
+    st.session_state.pop('last_error', None)
+    st.session_state.pop('last_error_tb', None)
+    st.session_state.enhance_button_pressed = True
+
+def _reset_enhancement():
+    """Clear all relevant session state values for the Start Over button"""
+    for key in ['enhance_button_pressed', 'after_score', 'report_html', 'last_error', 'last_error_tb']:
+        st.session_state.pop(key, None)
+
+@st.cache_data
 def create_gauge_chart(score, title, color='#2E7D32'):
-    """Create a gauge chart for the score"""
+    """
+    Create a gauge chart for the score
+    
+    Returns the figure as a plain dict, which st.plotly_chart accepts directly.
+    Results are cached per (score, title, color), so plotly is only imported
+    and the figure only built on the first call for each combination.
+    """
     import plotly.graph_objects as go
     
     fig = go.Figure(go.Indicator(
@@ -640,29 +808,25 @@ def create_gauge_chart(score, title, color='#2E7D32'):
         paper_bgcolor='white',
     )
     
-    return fig 
+    return fig.to_dict()
+
+# (text color, background color) for low, medium and high scores
+_SCORE_COLORS = (
+    ("#F44336", "#FFEBEE"),  # Red
+    ("#FF9800", "#FFF3E0"),  # Orange
+    ("#4CAF50", "#E8F5E9"),  # Green
+)
 
-def display_category_score(category, score):
-    """Display a category score with appropriate styling"""
+def _score_card_html(category, score):
+    """Build the HTML for a category score card with appropriate styling"""
     
     # Determine color based on score
-    if score >= 80:
-        color = "#4CAF50"  # Green
-        bg_color = "#E8F5E9"
-    elif score >= 60:
-        color = "#FF9800"  # Orange
-        bg_color = "#FFF3E0"
-    else:
-        color = "#F44336"  # Red
-        bg_color = "#FFEBEE"
+    color, bg_color = _SCORE_COLORS[2 if score >= 80 else 1 if score >= 60 else 0]
     
-    # Display score with styled container
-    st.markdown(
-        f"""
-        <div style="background-color: {bg_color}; padding: 15px; border-radius: 8px; text-align: center;">
-            <h4 style="margin-top: 0; margin-bottom: 5px;">{category}</h4>
-            <div style="font-size: 24px; font-weight: bold; color: {color};">{score}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
+    # Styled container, kept on one line so the cards join into one HTML block
+    return (
+        f'<div style="background-color: {bg_color}; padding: 15px; border-radius: 8px; text-align: center;">'
+        f'<h4 style="margin-top: 0; margin-bottom: 5px;">{category}</h4>'
+        f'<div style="font-size: 24px; font-weight: bold; color: {color};">{score}</div>'
+        "</div>"
     ) 
\ No newline at end of file
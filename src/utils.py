@@ -3,102 +3,30 @@ Utility functions for the PowerPoint Accessibility Enhancer
 """
 
 import os
+import streamlit as st
 import tempfile
 import base64
-import pandas as pd
-import matplotlib.pyplot as plt
-import io
+import string
 
-def create_comparison_chart(before_score, after_score, categories):
-    """Create a comparison chart of before and after scores"""
-    fig, ax = plt.subplots(figsize=(10, 6))
-    
-    # Extract category scores
-    before_cat_scores = [before_score['category_scores'][cat] for cat in categories]
-    after_cat_scores = [after_score['category_scores'][cat] for cat in categories]
-    
-    # Add overall scores
-    categories = categories + ['Overall']
-    before_cat_scores.append(before_score['overall_score'])
-    after_cat_scores.append(after_score['overall_score'])
-    
-    x = range(len(categories))
-    width = 0.35
-    
-    ax.bar([i - width/2 for i in x], before_cat_scores, width, label='Before', color='#ff9999')
-    ax.bar([i + width/2 for i in x], after_cat_scores, width, label='After', color='#99cc99')
-    
-    ax.set_ylabel('Score')
-    ax.set_title('Accessibility Score Comparison')
-    ax.set_xticks(x)
-    ax.set_xticklabels(categories)
-    ax.legend()
-    
-    plt.ylim(0, 100)
-    
-    for i, v in enumerate(before_cat_scores):
-        ax.text(i - width/2, v + 3, str(round(v)), ha='center')
-    
-    for i, v in enumerate(after_cat_scores):
-        ax.text(i + width/2, v + 3, str(round(v)), ha='center')
-    
-    # Save chart to buffer
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
-    
-    # Get image as base64 string
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    
-    plt.close()
-    
-    return image_base64
-
-def generate_report_html(before_score, after_score, before_wcag_report, after_wcag_report, wmf_count=0):
-    """
-    Generate an HTML report comparing before and after accessibility improvements
-    
-    Args:
-        before_score (dict): Score report before enhancement
-        after_score (dict): Score report after enhancement
-        before_wcag_report (dict): WCAG report before enhancement
-        after_wcag_report (dict): WCAG report after enhancement
-        wmf_count (int): Number of WMF images found
-        
-    Returns:
-        str: HTML report content
-    """
-    # Calculate statistics
-    alt_text_count = after_score["category_scores"]["alt_text"] - before_score["category_scores"]["alt_text"]
-    font_size_improvement = after_score["category_scores"]["font_size"] - before_score["category_scores"]["font_size"]
-    contrast_improvement = after_score["category_scores"]["contrast"] - before_score["category_scores"]["contrast"]
-    text_simpler = after_score["category_scores"]["text_complexity"] - before_score["category_scores"]["text_complexity"]
-    
-    # Convert negative improvements to zero (in case something got worse)
-    alt_text_count = max(0, alt_text_count)
-    font_size_improvement = max(0, font_size_improvement)
-    contrast_improvement = max(0, contrast_improvement)
-    text_simpler = max(0, text_simpler)
-    
-    # Create comprehensive HTML report
-    html_report = f"""
+# HTML report layout, parsed once at import and filled in by generate_report_html
+_REPORT_TEMPLATE = string.Template("""
     <html>
     <head>
         <title>Accessibility Enhancement Report</title>
         <style>
-            body {{ font-family: Arial, sans-serif; margin: 40px; }}
-            h1 {{ color: #2E7D32; }}
-            h2 {{ color: #1565C0; }}
-            .section {{ background: #E8F5E9; padding: 15px; border-radius: 8px; margin: 10px 0; }}
-            .warning {{ background: #FFF3E0; padding: 15px; border-radius: 8px; margin: 10px 0; }}
-            .comparison {{ display: flex; justify-content: space-between; }}
-            .score-card {{ flex: 1; margin: 10px; padding: 15px; border-radius: 8px; background: #f5f5f5; }}
-            .improvement {{ color: green; font-weight: bold; }}
-            .card {{ padding: 15px; margin: 10px 0; border-radius: 8px; }}
-            .green-card {{ background-color: #E8F5E9; }}
-            .blue-card {{ background-color: #E3F2FD; }}
-            .yellow-card {{ background-color: #FFF8E1; }}
-            .purple-card {{ background-color: #F3E5F5; }}
+            body { font-family: Arial, sans-serif; margin: 40px; }
+            h1 { color: #2E7D32; }
+            h2 { color: #1565C0; }
+            .section { background: #E8F5E9; padding: 15px; border-radius: 8px; margin: 10px 0; }
+            .warning { background: #FFF3E0; padding: 15px; border-radius: 8px; margin: 10px 0; }
+            .comparison { display: flex; justify-content: space-between; }
+            .score-card { flex: 1; margin: 10px; padding: 15px; border-radius: 8px; background: #f5f5f5; }
+            .improvement { color: green; font-weight: bold; }
+            .card { padding: 15px; margin: 10px 0; border-radius: 8px; }
+            .green-card { background-color: #E8F5E9; }
+            .blue-card { background-color: #E3F2FD; }
+            .yellow-card { background-color: #FFF8E1; }
+            .purple-card { background-color: #F3E5F5; }
         </style>
     </head>
     <body>
@@ -111,12 +39,12 @@ def generate_report_html(before_score, after_score, before_wcag_report, after_wc
             <div class="comparison">
                 <div class="score-card">
                     <h3>Before</h3>
-                    <p><strong>Overall Score:</strong> {before_score["overall_score"]}/100</p>
+                    <p><strong>Overall Score:</strong> $before_overall/100</p>
                 </div>
                 <div class="score-card" style="background-color: #E8F5E9;">
                     <h3>After</h3>
-                    <p><strong>Overall Score:</strong> {after_score["overall_score"]}/100</p>
-                    <p class="improvement">Improvement: +{after_score["overall_score"] - before_score["overall_score"]} points</p>
+                    <p><strong>Overall Score:</strong> $after_overall/100</p>
+                    <p class="improvement">Improvement: +$overall_improvement points</p>
                 </div>
             </div>
         </div>
@@ -125,33 +53,33 @@ def generate_report_html(before_score, after_score, before_wcag_report, after_wc
         
         <div class="card green-card">
             <h3>Image Accessibility</h3>
-            <p><strong>Before:</strong> {before_score["category_scores"]["alt_text"]}/100</p>
-            <p><strong>After:</strong> {after_score["category_scores"]["alt_text"]}/100</p>
+            <p><strong>Before:</strong> $before_alt_text/100</p>
+            <p><strong>After:</strong> $after_alt_text/100</p>
             <p>Added or improved alt text for images to assist screen reader users.</p>
         </div>
         
         <div class="card blue-card">
             <h3>Font Size Readability</h3>
-            <p><strong>Before:</strong> {before_score["category_scores"]["font_size"]}/100</p>
-            <p><strong>After:</strong> {after_score["category_scores"]["font_size"]}/100</p>
+            <p><strong>Before:</strong> $before_font_size/100</p>
+            <p><strong>After:</strong> $after_font_size/100</p>
             <p>Increased font sizes to improve readability for those with visual impairments.</p>
         </div>
         
         <div class="card yellow-card">
             <h3>Contrast Enhancement</h3>
-            <p><strong>Before:</strong> {before_score["category_scores"]["contrast"]}/100</p>
-            <p><strong>After:</strong> {after_score["category_scores"]["contrast"]}/100</p>
+            <p><strong>Before:</strong> $before_contrast/100</p>
+            <p><strong>After:</strong> $after_contrast/100</p>
             <p>Improved text contrast to make content more readable.</p>
         </div>
         
         <div class="card purple-card">
             <h3>Text Simplification</h3>
-            <p><strong>Before:</strong> {before_score["category_scores"]["text_complexity"]}/100</p>
-            <p><strong>After:</strong> {after_score["category_scores"]["text_complexity"]}/100</p>
+            <p><strong>Before:</strong> $before_text_complexity/100</p>
+            <p><strong>After:</strong> $after_text_complexity/100</p>
             <p>Simplified complex text to be more understandable.</p>
         </div>
         
-        {f'<div class="warning"><h3>Special Image Formats</h3><p>Found {wmf_count} WMF/EMF image(s) that require special handling. These formats have limited accessibility support in PowerPoint.</p></div>' if wmf_count > 0 else ''}
+        $wmf_warning
         
         <div class="section">
             <h2>Next Steps</h2>
@@ -170,48 +98,40 @@ def generate_report_html(before_score, after_score, before_wcag_report, after_wc
         </p>
     </body>
     </html>
-    """
-    
-    return html_report
+    """)
 
-def create_wcag_compliance_chart(wcag_report):
-    """Create a chart showing WCAG compliance status"""
-    compliance_status = {
-        "Pass": 0,
-        "Fail": 0
-    }
-    
-    # Count pass/fail criteria
-    for criteria, details in wcag_report.items():
-        compliance_status[details["compliance"]] += 1
-    
-    # Create a pie chart
-    fig, ax = plt.subplots(figsize=(6, 6))
-    
-    # Colors for the pie chart
-    colors = ['#4CAF50', '#F44336']
+_WMF_WARNING = (
+    '<div class="warning"><h3>Special Image Formats</h3><p>Found {wmf_count} WMF/EMF image(s) '
+    'that require special handling. These formats have limited accessibility support in PowerPoint.</p></div>'
+)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def generate_report_html(before_score, after_score, before_wcag_report, after_wcag_report, wmf_count=0):
+    """
+    Generate an HTML report comparing before and after accessibility improvements
     
-    # Create pie chart
-    wedges, texts, autotexts = ax.pie(
-        [compliance_status["Pass"], compliance_status["Fail"]], 
-        labels=["Pass", "Fail"],
-        autopct='%1.1f%%',
-        colors=colors,
-        startangle=90
+    Args:
+        before_score (dict): Score report before enhancement
+        after_score (dict): Score report after enhancement
+        before_wcag_report (dict): WCAG report before enhancement
+        after_wcag_report (dict): WCAG report after enhancement
+        wmf_count (int): Number of WMF images found
+        
+    Returns:
+        str: HTML report content
+    """
+    # Fill in the comprehensive HTML report
+    return _REPORT_TEMPLATE.substitute(
+        before_overall=before_score["overall_score"],
+        after_overall=after_score["overall_score"],
+        overall_improvement=after_score["overall_score"] - before_score["overall_score"],
+        before_alt_text=before_score["category_scores"]["alt_text"],
+        after_alt_text=after_score["category_scores"]["alt_text"],
+        before_font_size=before_score["category_scores"]["font_size"],
+        after_font_size=after_score["category_scores"]["font_size"],
+        before_contrast=before_score["category_scores"]["contrast"],
+        after_contrast=after_score["category_scores"]["contrast"],
+        before_text_complexity=before_score["category_scores"]["text_complexity"],
+        after_text_complexity=after_score["category_scores"]["text_complexity"],
+        wmf_warning=_WMF_WARNING.format(wmf_count=wmf_count) if wmf_count > 0 else ''
     )
-    
-    # Equal aspect ratio ensures that pie is drawn as a circle
-    ax.axis('equal')
-    plt.title('WCAG 2.0 Compliance Status')
-    
-    # Save chart to buffer
-    buffer = io.BytesIO()
-    plt.savefig(buffer, format='png')
-    buffer.seek(0)
-    
-    # Get image as base64 string
-    image_base64 = base64.b64encode(buffer.getvalue()).decode('utf-8')
-    
-    plt.close()
-    
-    return image_base64 
\ No newline at end of file